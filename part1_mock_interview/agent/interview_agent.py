@@ -1,20 +1,38 @@
 """Custom Interview Agent extending Agent class."""
 import asyncio
 import logging
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 from livekit.agents import Agent, llm
 from agent.state_manager import InterviewStage, InterviewStateManager
-from prompts.system_prompts import get_stage_prompt
+from prompts.system_prompts import get_stage_prompt, get_initial_instructions
 from tools.interview_tools import (
     transition_to_past_experience,
     complete_interview,
     request_more_details
 )
 from config.settings import SELF_INTRO_TIMEOUT, PAST_EXPERIENCE_TIMEOUT
-from utils.structured_logging import StructuredLogger
+from utils.structured_logging import StructuredLogger, to_json_bytes
 
 logger = logging.getLogger(__name__)
 
+# Built once per process rather than per session
+_TOOLS = (transition_to_past_experience, complete_interview, request_more_details)
+_INTRO_REFERENCE_NOTE = (
+    "\n\nNote: The candidate has already introduced themselves. "
+    "Reference their introduction naturally when asking about past experiences."
+)
+
+# Per-stage timeout (stages without one are never timed out) and the stage
+# a timeout moves to
+_STAGE_TIMEOUTS = {
+    InterviewStage.SELF_INTRODUCTION: SELF_INTRO_TIMEOUT,
+    InterviewStage.PAST_EXPERIENCE: PAST_EXPERIENCE_TIMEOUT,
+}
+_TIMEOUT_NEXT_STAGE = {
+    InterviewStage.SELF_INTRODUCTION: InterviewStage.PAST_EXPERIENCE,
+    InterviewStage.PAST_EXPERIENCE: InterviewStage.CLOSING,
+}
+
 
 class InterviewAgent(Agent):
     """Custom agent for conducting mock interviews with stage management."""
@@ -27,35 +45,46 @@ class InterviewAgent(Agent):
             session_id: Optional session ID for logging
         """
         self.state_manager = InterviewStateManager()
-        self.timeout_task: Optional[asyncio.Task] = None
+        # Single long-lived timeout monitor, re-armed via the activity event
+        self._activity: Optional[asyncio.Event] = None
+        self._monitor_task: Optional[asyncio.Task] = None
         self.timeout_seconds: Optional[int] = None
         self.session_id = session_id or "unknown"
         
+        # Stage the instructions were last set for; they only change with the stage
+        self._last_stage = InterviewStage.GREETING
+        
+        # LLM tool name -> handler(args), built once instead of an if/elif chain
+        self._fn_dispatch: Dict[str, Callable[[Dict[str, Any]], Awaitable[None]]] = {
+            "transition_to_past_experience": lambda _args: self._transition(
+                InterviewStage.PAST_EXPERIENCE, "function_call"
+            ),
+            "complete_interview": lambda _args: self._transition(
+                InterviewStage.CLOSING, "function_call"
+            ),
+            "request_more_details": self._log_more_details_request,
+        }
+        
         # Initialize structured logger
         self.slog = StructuredLogger(__name__, logger)
         self.slog.set_session_id(self.session_id)
+        # Stage is bound once here and re-bound on each transition
+        self.slog = self.slog.bind(stage=self.state_manager.current_stage.value)
         
         # Initialize Agent with greeting stage instructions
         super().__init__(
-            instructions=get_stage_prompt(InterviewStage.GREETING),
-            tools=[
-                transition_to_past_experience,
-                complete_interview,
-                request_more_details
-            ]
+            instructions=get_initial_instructions(),
+            tools=list(_TOOLS)
         )
         
-        self.slog.info(
-            "agent_initialized",
-            stage=self.state_manager.current_stage.value
-        )
+        self.slog.info("agent_initialized")
     
     async def on_agent_started(self):
         """
         Called when the agent starts.
         Start timeout monitoring for the greeting/self-intro stage.
         """
-        self.slog.info("agent_started", stage=self.state_manager.current_stage.value)
+        self.slog.info("agent_started")
         # Start timeout monitoring for greeting stage (will transition to self-intro)
         self._start_timeout_monitoring(SELF_INTRO_TIMEOUT)
     
@@ -66,15 +95,16 @@ class InterviewAgent(Agent):
         Args:
             message: The user's message
         """
+        # Log user speech
+        self.slog.user_speech(message=message)
+        
+        # Nothing left to track or transition once the interview is closing
+        if self.state_manager.current_stage is InterviewStage.CLOSING:
+            return
+        
         # Store user response in context
         self.state_manager.add_user_response(message)
         
-        # Log user speech
-        self.slog.user_speech(
-            message=message,
-            stage=self.state_manager.current_stage.value
-        )
-        
         # Reset stage timer on user activity (restart timeout monitoring)
         self.state_manager.reset_stage_timer()
         self._restart_timeout_monitoring()
@@ -93,32 +123,14 @@ class InterviewAgent(Agent):
             message: The agent's message
         """
         # Log agent speech
-        self.slog.agent_speech(
-            message=message,
-            stage=self.state_manager.current_stage.value
-        )
+        self.slog.agent_speech(message=message)
+        
+        if self.state_manager.current_stage is InterviewStage.CLOSING:
+            return
         
         # Transition from greeting to self-introduction after greeting completes
         if self.state_manager.current_stage == InterviewStage.GREETING:
-            success, error = self.state_manager.transition_to(
-                InterviewStage.SELF_INTRODUCTION,
-                reason="greeting_complete"
-            )
-            if success:
-                self.instructions = get_stage_prompt(InterviewStage.SELF_INTRODUCTION)
-                self._start_timeout_monitoring(SELF_INTRO_TIMEOUT)
-                self.slog.stage_transition(
-                    from_stage=InterviewStage.GREETING.value,
-                    to_stage=InterviewStage.SELF_INTRODUCTION.value,
-                    reason="greeting_complete",
-                    time_in_stage=self.state_manager.get_time_in_stage()
-                )
-            else:
-                self.slog.error_event(
-                    error_type="transition_failed",
-                    error_message=error or "Unknown error",
-                    stage=self.state_manager.current_stage.value
-                )
+            await self._transition(InterviewStage.SELF_INTRODUCTION, "greeting_complete")
         
         # Check for timeout after agent speaks
         await self._check_and_handle_timeout()
@@ -133,107 +145,81 @@ class InterviewAgent(Agent):
         # Log function call
         self.slog.function_call(
             function_name=fnc.name,
-            args=fnc.args or {},
-            stage=self.state_manager.current_stage.value
+            args=fnc.args or {}
         )
         
-        if fnc.name == "transition_to_past_experience":
-            await self._transition_to_past_experience()
-        elif fnc.name == "complete_interview":
-            await self._complete_interview()
-        elif fnc.name == "request_more_details":
-            # This is handled by the LLM naturally, just log it
-            self.slog.debug(
-                "request_more_details",
-                topic=fnc.args.get('topic', 'unknown') if fnc.args else 'unknown'
-            )
+        handler = self._fn_dispatch.get(fnc.name)
+        if handler:
+            await handler(fnc.args or {})
+    
+    async def _log_more_details_request(self, args: Dict[str, Any]):
+        """This is handled by the LLM naturally, just log it."""
+        self.slog.debug(
+            "request_more_details",
+            topic=args.get('topic', 'unknown')
+        )
     
-    async def _transition_to_past_experience(self):
-        """Transition to past experience stage."""
-        if self.state_manager.current_stage == InterviewStage.PAST_EXPERIENCE:
+    async def _transition(self, target: InterviewStage, reason: str):
+        """
+        Transition to a new stage and update instructions, timeout and logs.
+        
+        Args:
+            target: The stage to transition to
+            reason: Reason recorded for the transition
+        """
+        if self.state_manager.current_stage == target:
             return
             
         from_stage = self.state_manager.current_stage
         time_in_stage = self.state_manager.get_time_in_stage()
         
         # Validate and perform transition
-        success, error = self.state_manager.transition_to(
-            InterviewStage.PAST_EXPERIENCE,
-            reason="function_call"
-        )
-        
-        if success:
-            # Update agent instructions with conversation context
-            prompt = get_stage_prompt(InterviewStage.PAST_EXPERIENCE)
-            # Add context about what was discussed in self-intro
-            context_summary = self.state_manager.get_conversation_summary()
-            if context_summary["conversation_context"]["self_introduction"]["background"]:
-                prompt += f"\n\nNote: The candidate has already introduced themselves. Reference their introduction naturally when asking about past experiences."
-            
-            self.instructions = prompt
-            
-            # Start timeout monitoring for new stage
-            self._start_timeout_monitoring(PAST_EXPERIENCE_TIMEOUT)
-            
-            # Log transition
-            self.slog.stage_transition(
-                from_stage=from_stage.value,
-                to_stage=InterviewStage.PAST_EXPERIENCE.value,
-                reason="function_call",
-                time_in_stage=time_in_stage
-            )
-        else:
+        success, error = self.state_manager.transition_to(target, reason=reason)
+        if not success:
             self.slog.error_event(
                 error_type="transition_failed",
-                error_message=error or "Unknown error",
-                stage=self.state_manager.current_stage.value
+                error_message=error or "Unknown error"
             )
-    
-    async def _complete_interview(self):
-        """Complete the interview."""
-        if self.state_manager.current_stage == InterviewStage.CLOSING:
             return
-            
-        from_stage = self.state_manager.current_stage
-        time_in_stage = self.state_manager.get_time_in_stage()
         
-        # Validate and perform transition
-        success, error = self.state_manager.transition_to(
-            InterviewStage.CLOSING,
-            reason="function_call"
-        )
+        # Update agent instructions
+        prompt = get_stage_prompt(target)
+        if target == InterviewStage.PAST_EXPERIENCE:
+            # Add context about what was discussed in self-intro
+            if self.state_manager.conversation_context.self_introduction.background:
+                prompt += _INTRO_REFERENCE_NOTE
+        self.instructions = prompt
+        self._last_stage = target
+        self.slog = self.slog.bind(stage=target.value)
         
-        if success:
-            # Update agent instructions
-            self.instructions = get_stage_prompt(InterviewStage.CLOSING)
-            
-            # Stop timeout monitoring (no more transitions)
-            self._stop_timeout_monitoring()
-            
-            # Log transition
-            self.slog.stage_transition(
-                from_stage=from_stage.value,
-                to_stage=InterviewStage.CLOSING.value,
-                reason="function_call",
-                time_in_stage=time_in_stage
-            )
-            
-            # Log interview completion summary
-            summary = self.state_manager.get_conversation_summary()
-            self.slog.info("interview_completed", **summary)
+        # Start timeout monitoring for the new stage, or stop it if it has none
+        timeout_seconds = _STAGE_TIMEOUTS.get(target)
+        if timeout_seconds:
+            self._start_timeout_monitoring(timeout_seconds)
         else:
-            self.slog.error_event(
-                error_type="transition_failed",
-                error_message=error or "Unknown error",
-                stage=self.state_manager.current_stage.value
-            )
+            self._stop_timeout_monitoring()
+        
+        # Log transition
+        self.slog.stage_transition(
+            from_stage=from_stage.value,
+            to_stage=target.value,
+            reason=reason,
+            time_in_stage=time_in_stage
+        )
+        
+        if target == InterviewStage.CLOSING:
+            # Log interview completion summary, serialized once up front
+            summary = to_json_bytes(self.state_manager.get_conversation_summary())
+            self.slog.info_raw("interview_completed", conversation_summary=summary)
     
     async def _update_stage_instructions(self):
         """Update agent instructions based on current stage."""
-        current_prompt = get_stage_prompt(self.state_manager.current_stage)
-        if self.instructions != current_prompt:
-            self.instructions = current_prompt
-            logger.debug(f"Updated instructions for stage: {self.state_manager.current_stage.value}")
+        stage = self.state_manager.current_stage
+        if self._last_stage == stage:
+            return
+        self.instructions = get_stage_prompt(stage)
+        self._last_stage = stage
+        logger.debug(f"Updated instructions for stage: {stage.value}")
     
     async def _check_and_handle_timeout(self):
         """
@@ -242,11 +228,7 @@ class InterviewAgent(Agent):
         stage = self.state_manager.current_stage
         
         # Determine timeout based on stage
-        timeout_seconds = None
-        if stage == InterviewStage.SELF_INTRODUCTION:
-            timeout_seconds = SELF_INTRO_TIMEOUT
-        elif stage == InterviewStage.PAST_EXPERIENCE:
-            timeout_seconds = PAST_EXPERIENCE_TIMEOUT
+        timeout_seconds = _STAGE_TIMEOUTS.get(stage)
         
         if timeout_seconds and self.state_manager.should_timeout(timeout_seconds):
             actual_time = self.state_manager.get_time_in_stage()
@@ -255,61 +237,62 @@ class InterviewAgent(Agent):
                 timeout_seconds=timeout_seconds,
                 actual_time=actual_time
             )
-            
-            if stage == InterviewStage.SELF_INTRODUCTION:
-                await self._transition_to_past_experience()
-            elif stage == InterviewStage.PAST_EXPERIENCE:
-                await self._complete_interview()
+            await self._transition(_TIMEOUT_NEXT_STAGE[stage], "timeout")
     
     def _start_timeout_monitoring(self, timeout_seconds: int):
         """
-        Start or restart timeout monitoring with a reusable task.
+        Start timeout monitoring, or re-arm the running monitor with a new duration.
         
         Args:
             timeout_seconds: Timeout duration in seconds
         """
-        # Cancel existing task if running
-        self._stop_timeout_monitoring()
-        
         # Store timeout duration
         self.timeout_seconds = timeout_seconds
         
-        # Start new monitoring task
-        self.timeout_task = asyncio.create_task(
-            self._monitor_timeout(timeout_seconds)
-        )
+        if self._monitor_task is None or self._monitor_task.done():
+            # Created lazily so the event binds to the running loop
+            self._activity = asyncio.Event()
+            self._monitor_task = asyncio.create_task(self._run_monitor())
+        else:
+            self._activity.set()
     
     def _restart_timeout_monitoring(self):
         """
-        Restart timeout monitoring with current timeout duration.
+        Restart the timeout countdown on activity (no new task is created).
         """
-        if self.timeout_seconds:
-            self._start_timeout_monitoring(self.timeout_seconds)
+        if self._monitor_task and not self._monitor_task.done():
+            self._activity.set()
     
     def _stop_timeout_monitoring(self):
-        """Stop timeout monitoring task."""
-        if self.timeout_task and not self.timeout_task.done():
-            self.timeout_task.cancel()
-            self.timeout_task = None
+        """Stop the timeout monitor task."""
+        if self._monitor_task and not self._monitor_task.done():
+            self._monitor_task.cancel()
+        self._monitor_task = None
     
-    async def _monitor_timeout(self, timeout_seconds: int):
+    async def _run_monitor(self):
         """
-        Background task to monitor timeout.
+        Background task that monitors the stage timeout for the whole session.
         
-        Args:
-            timeout_seconds: Timeout duration in seconds
+        Waits on the activity event with the remaining stage time as timeout;
+        activity (or a stage change) wakes it up to recompute the deadline.
         """
         try:
-            await asyncio.sleep(timeout_seconds)
-            # Check timeout again (user might have spoken, resetting the timer)
-            await self._check_and_handle_timeout()
+            while self.timeout_seconds:
+                remaining = max(0.0, self.timeout_seconds - self.state_manager.get_time_in_stage())
+                try:
+                    await asyncio.wait_for(self._activity.wait(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    # Check timeout again (user might have spoken, resetting the timer)
+                    await self._check_and_handle_timeout()
+                    # Idle until activity or a stage change re-arms the deadline
+                    await self._activity.wait()
+                self._activity.clear()
         except asyncio.CancelledError:
             self.slog.debug("timeout_monitoring_cancelled")
         except Exception as e:
             self.slog.error_event(
                 error_type="timeout_monitoring_error",
-                error_message=str(e),
-                stage=self.state_manager.current_stage.value
+                error_message=str(e)
             )
     
     def get_state_info(self) -> dict:
@@ -319,5 +302,5 @@ class InterviewAgent(Agent):
     def on_agent_ended(self):
         """Called when agent ends. Clean up resources."""
         self._stop_timeout_monitoring()
-        self.slog.info("agent_ended", stage=self.state_manager.current_stage.value)
+        self.slog.info("agent_ended")
 
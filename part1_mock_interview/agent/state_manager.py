@@ -1,5 +1,9 @@
 """State management for interview stages."""
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from enum import Enum
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List, Tuple
 import time
 
@@ -12,36 +16,80 @@ class InterviewStage(Enum):
     CLOSING = "closing"
 
 
-# Valid transition map: from_stage -> [allowed_to_stages]
+# Valid transition map: from_stage -> {allowed_to_stages}
 VALID_TRANSITIONS = {
-    InterviewStage.GREETING: [InterviewStage.SELF_INTRODUCTION],
-    InterviewStage.SELF_INTRODUCTION: [InterviewStage.PAST_EXPERIENCE],
-    InterviewStage.PAST_EXPERIENCE: [InterviewStage.CLOSING],
-    InterviewStage.CLOSING: []  # No transitions from closing
+    InterviewStage.GREETING: frozenset({InterviewStage.SELF_INTRODUCTION}),
+    InterviewStage.SELF_INTRODUCTION: frozenset({InterviewStage.PAST_EXPERIENCE}),
+    InterviewStage.PAST_EXPERIENCE: frozenset({InterviewStage.CLOSING}),
+    InterviewStage.CLOSING: frozenset()  # No transitions from closing
 }
 
+# Maximum number of raw responses kept per stage; older ones are folded
+# into the rolling summary
+MAX_STAGE_RESPONSES = 32
+
+
+# Explicit __slots__ rather than dataclass(slots=True), which needs Python 3.10+
+@dataclass
+class SelfIntroductionContext:
+    """Key information gathered during the self-introduction stage."""
+    __slots__ = ("name", "background", "key_points")
+    name: Optional[str]
+    background: List[Any]
+    key_points: List[str]
+
+
+@dataclass
+class PastExperienceContext:
+    """Key information gathered during the past experience stage."""
+    __slots__ = ("roles", "achievements", "challenges")
+    roles: List[Any]
+    achievements: List[Any]
+    challenges: List[Any]
+
+
+@dataclass
+class TransitionRecord:
+    """A single stage transition; timestamp is a raw epoch float."""
+    __slots__ = ("from_stage", "to_stage", "reason", "timestamp", "time_in_previous_stage")
+    from_stage: str
+    to_stage: str
+    reason: str
+    timestamp: float
+    time_in_previous_stage: float
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """Timestamp formatted as ISO-8601 UTC (computed only when read)."""
+        return datetime.fromtimestamp(self.timestamp, tz=timezone.utc).isoformat()
+
+
+@dataclass
+class ConversationContext:
+    """Conversation context carried across interview stages."""
+    __slots__ = ("self_introduction", "past_experience")
+    self_introduction: SelfIntroductionContext
+    past_experience: PastExperienceContext
+
 
 class InterviewStateManager:
     """Manages the state and transitions of the interview process."""
     
     def __init__(self):
+        # Monotonic clock for stage timing (immune to wall-clock/NTP jumps),
+        # bound once to skip the module attribute lookup per call
+        self._clock = time.monotonic
         self.current_stage = InterviewStage.GREETING
-        self.stage_start_time = time.time()
+        self.stage_start_time = self._clock()
         self.stage_context: Dict[str, Any] = {}
-        self.transition_history: List[Dict[str, Any]] = []
+        self.transition_history: List[TransitionRecord] = []
+        # Rolling per-stage summary of responses evicted from stage_context
+        self._rolling_summary: Dict[str, str] = {}
         # Conversation context: stores key information from each stage
-        self.conversation_context: Dict[str, Any] = {
-            "self_introduction": {
-                "name": None,
-                "background": [],
-                "key_points": []
-            },
-            "past_experience": {
-                "roles": [],
-                "achievements": [],
-                "challenges": []
-            }
-        }
+        self.conversation_context = ConversationContext(
+            self_introduction=SelfIntroductionContext(name=None, background=[], key_points=[]),
+            past_experience=PastExperienceContext(roles=[], achievements=[], challenges=[])
+        )
         
     def can_transition_to(self, new_stage: InterviewStage) -> Tuple[bool, Optional[str]]:
         """
@@ -53,7 +101,7 @@ class InterviewStateManager:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        allowed_transitions = VALID_TRANSITIONS.get(self.current_stage, [])
+        allowed_transitions = VALID_TRANSITIONS.get(self.current_stage, frozenset())
         if new_stage not in allowed_transitions:
             return False, f"Cannot transition from {self.current_stage.value} to {new_stage.value}"
         return True, None
@@ -81,16 +129,16 @@ class InterviewStateManager:
         self._save_stage_context()
         
         # Record transition
-        self.transition_history.append({
-            "from": self.current_stage.value,
-            "to": new_stage.value,
-            "reason": reason,
-            "timestamp": time.time(),
-            "time_in_previous_stage": self.get_time_in_stage()
-        })
+        self.transition_history.append(TransitionRecord(
+            from_stage=self.current_stage.value,
+            to_stage=new_stage.value,
+            reason=reason,
+            timestamp=time.time(),  # wall clock; format via timestamp_iso when needed
+            time_in_previous_stage=self.get_time_in_stage()
+        ))
         
         self.current_stage = new_stage
-        self.stage_start_time = time.time()
+        self.stage_start_time = self._clock()
         self.stage_context = {}
         
         return True, None
@@ -100,14 +148,14 @@ class InterviewStateManager:
         if self.current_stage == InterviewStage.SELF_INTRODUCTION:
             # Extract key information from self-intro context
             if "responses" in self.stage_context:
-                self.conversation_context["self_introduction"]["background"] = \
-                    self.stage_context.get("responses", [])
+                self.conversation_context.self_introduction.background = \
+                    list(self.stage_context.get("responses", []))
         elif self.current_stage == InterviewStage.PAST_EXPERIENCE:
             # Extract key information from past experience context
             if "responses" in self.stage_context:
-                self.conversation_context["past_experience"]["roles"] = \
+                self.conversation_context.past_experience.roles = \
                     self.stage_context.get("roles", [])
-                self.conversation_context["past_experience"]["achievements"] = \
+                self.conversation_context.past_experience.achievements = \
                     self.stage_context.get("achievements", [])
     
     def add_user_response(self, response: str):
@@ -117,13 +165,31 @@ class InterviewStateManager:
         Args:
             response: The user's response text
         """
-        if "responses" not in self.stage_context:
-            self.stage_context["responses"] = []
-        self.stage_context["responses"].append({
+        responses = self.stage_context.get("responses")
+        if responses is None:
+            responses = self.stage_context["responses"] = deque(maxlen=MAX_STAGE_RESPONSES)
+        elif len(responses) == responses.maxlen:
+            self._summarize_response(responses[0]["text"])
+        responses.append({
             "text": response,
-            "timestamp": time.time()
+            "timestamp": time.time()  # wall clock, comparable to TransitionRecord.timestamp
         })
     
+    def _summarize_response(self, text: str):
+        """
+        Fold an evicted response into the rolling summary for the current stage.
+        
+        Args:
+            text: The response text about to be dropped from stage context
+        """
+        # Keep only the first sentence as the key fact
+        fact = text.strip().split(". ", 1)[0].rstrip(".")
+        if not fact:
+            return
+        stage = self.current_stage.value
+        existing = self._rolling_summary.get(stage)
+        self._rolling_summary[stage] = f"{existing}. {fact}" if existing else fact
+    
     def add_key_point(self, key_point: str):
         """
         Add a key point extracted from user responses.
@@ -140,18 +206,21 @@ class InterviewStateManager:
         Get a summary of the conversation so far.
         
         Returns:
-            Dictionary with conversation summary
+            Dictionary with conversation summary. The conversation context and
+            rolling summary reference live state (not copies) and must not be
+            mutated by callers.
         """
         return {
             "current_stage": self.current_stage.value,
-            "stages_completed": [t["from"] for t in self.transition_history],
-            "conversation_context": self.conversation_context.copy(),
-            "total_transitions": len(self.transition_history)
+            "stages_completed": [t.from_stage for t in self.transition_history],
+            "conversation_context": self.conversation_context,
+            "total_transitions": len(self.transition_history),
+            "summary": MappingProxyType(self._rolling_summary)
         }
     
     def get_time_in_stage(self) -> float:
         """Get time elapsed in current stage in seconds."""
-        return time.time() - self.stage_start_time
+        return self._clock() - self.stage_start_time
         
     def should_timeout(self, timeout_seconds: int) -> bool:
         """
@@ -167,14 +236,14 @@ class InterviewStateManager:
     
     def reset_stage_timer(self):
         """Reset the stage timer (useful when user is actively speaking)."""
-        self.stage_start_time = time.time()
+        self.stage_start_time = self._clock()
     
     def get_stage_info(self) -> Dict[str, Any]:
-        """Get current stage information."""
+        """Get current stage information (context is a read-only view)."""
         return {
             "stage": self.current_stage.value,
             "time_in_stage": self.get_time_in_stage(),
-            "context": self.stage_context.copy(),
+            "context": MappingProxyType(self.stage_context),
             "conversation_summary": self.get_conversation_summary()
         }
 
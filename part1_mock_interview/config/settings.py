@@ -1,25 +1,70 @@
 """Configuration settings for the interview agent."""
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable snapshot of the environment configuration."""
+    __slots__ = (
+        "livekit_url", "livekit_api_key", "livekit_api_secret",
+        "openai_api_key", "assemblyai_api_key",
+        "self_intro_timeout", "past_experience_timeout",
+        "llm_model", "tts_voice",
+    )
+    # LiveKit Configuration
+    livekit_url: str
+    livekit_api_key: str
+    livekit_api_secret: str
+    # AI Service API Keys
+    openai_api_key: str
+    assemblyai_api_key: str
+    # Interview Configuration (seconds)
+    self_intro_timeout: int
+    past_experience_timeout: int
+    # Model Configuration
+    llm_model: str
+    tts_voice: str
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Read and parse the environment once; later calls return the same object."""
+    return Settings(
+        livekit_url=os.getenv("LIVEKIT_URL", ""),
+        livekit_api_key=os.getenv("LIVEKIT_API_KEY", ""),
+        livekit_api_secret=os.getenv("LIVEKIT_API_SECRET", ""),
+        openai_api_key=os.getenv("OPENAI_API_KEY", ""),
+        assemblyai_api_key=os.getenv("ASSEMBLYAI_API_KEY", ""),
+        self_intro_timeout=int(os.getenv("SELF_INTRO_TIMEOUT", "45")),
+        past_experience_timeout=int(os.getenv("PAST_EXPERIENCE_TIMEOUT", "60")),
+        # Note: gpt-3.5-turbo is cheaper than gpt-4/gpt-4o but still works well
+        # Options: gpt-3.5-turbo (cheapest), gpt-4, gpt-4-turbo, gpt-4o (most expensive)
+        llm_model=os.getenv("LLM_MODEL", "gpt-3.5-turbo"),
+        tts_voice=os.getenv("TTS_VOICE", "alloy"),
+    )
+
+
+# Module-level names kept for existing imports
+_settings = get_settings()
+
 # LiveKit Configuration
-LIVEKIT_URL = os.getenv("LIVEKIT_URL", "")
-LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY", "")
-LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "")
+LIVEKIT_URL = _settings.livekit_url
+LIVEKIT_API_KEY = _settings.livekit_api_key
+LIVEKIT_API_SECRET = _settings.livekit_api_secret
 
 # AI Service API Keys
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY", "")
+OPENAI_API_KEY = _settings.openai_api_key
+ASSEMBLYAI_API_KEY = _settings.assemblyai_api_key
 
 # Interview Configuration
-SELF_INTRO_TIMEOUT = int(os.getenv("SELF_INTRO_TIMEOUT", "45"))  # seconds
-PAST_EXPERIENCE_TIMEOUT = int(os.getenv("PAST_EXPERIENCE_TIMEOUT", "60"))  # seconds
+SELF_INTRO_TIMEOUT = _settings.self_intro_timeout  # seconds
+PAST_EXPERIENCE_TIMEOUT = _settings.past_experience_timeout  # seconds
 
 # Model Configuration
-# Note: gpt-3.5-turbo is cheaper than gpt-4/gpt-4o but still works well
-# Options: gpt-3.5-turbo (cheapest), gpt-4, gpt-4-turbo, gpt-4o (most expensive)
-LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
-TTS_VOICE = os.getenv("TTS_VOICE", "alloy")
-
+LLM_MODEL = _settings.llm_model
+TTS_VOICE = _settings.tts_voice
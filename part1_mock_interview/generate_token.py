@@ -1,9 +1,19 @@
 """Generate LiveKit token with agent dispatch using the official SDK."""
 import asyncio
+import time
+from datetime import timedelta
+from typing import Dict, Tuple
+import orjson
 from livekit import api
 from livekit.api import AccessToken, VideoGrants, RoomConfiguration, RoomAgentDispatch
 from config.settings import LIVEKIT_API_KEY, LIVEKIT_API_SECRET
 
+# Tokens are reused per (room, participant) until shortly before they expire
+TOKEN_TTL = timedelta(hours=6)
+_TOKEN_REUSE_SECONDS = TOKEN_TTL.total_seconds() - 600
+_TOKEN_CACHE_MAX_SIZE = 256
+_token_cache: Dict[Tuple[str, str], Tuple[str, float]] = {}
+
 
 def generate_token_with_agent_dispatch(
     room_name: str = "interview-demo",
@@ -12,6 +22,9 @@ def generate_token_with_agent_dispatch(
     """
     Generate a LiveKit access token with agent dispatch configuration.
     
+    Signed tokens are cached per (room, participant) and reused until ten
+    minutes before they expire.
+    
     Args:
         room_name: Name of the room
         participant_name: Name/identity of the participant
@@ -19,8 +32,14 @@ def generate_token_with_agent_dispatch(
     Returns:
         JWT token string
     """
+    cache_key = (room_name, participant_name)
+    cached = _token_cache.get(cache_key)
+    if cached and time.monotonic() - cached[1] < _TOKEN_REUSE_SECONDS:
+        return cached[0]
+    
     # Create access token
     token = AccessToken(LIVEKIT_API_KEY, LIVEKIT_API_SECRET) \
+        .with_ttl(TOKEN_TTL) \
         .with_identity(participant_name) \
         .with_name(participant_name) \
         .with_grants(VideoGrants(
@@ -36,7 +55,7 @@ def generate_token_with_agent_dispatch(
         agents=[
             RoomAgentDispatch(
                 agent_name="interview-agent",
-                metadata='{"participant": "' + participant_name + '"}'
+                metadata=orjson.dumps({"participant": participant_name}).decode()
             )
         ]
     )
@@ -44,6 +63,9 @@ def generate_token_with_agent_dispatch(
     
     # Generate JWT
     jwt_token = token.to_jwt()
+    if len(_token_cache) >= _TOKEN_CACHE_MAX_SIZE:
+        _token_cache.clear()
+    _token_cache[cache_key] = (jwt_token, time.monotonic())
     return jwt_token
 
 
@@ -1,10 +1,16 @@
 """Main entrypoint for the LiveKit Interview Agent."""
 import asyncio
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
+import threading
 from livekit import agents
 from livekit.agents import JobContext, WorkerOptions, cli
 from livekit.plugins import openai, silero, assemblyai
 from agent.interview_agent import InterviewAgent
+from utils.structured_logging import BufferedStreamHandler
 from config.settings import (
     LIVEKIT_URL,
     LIVEKIT_API_KEY,
@@ -16,13 +22,75 @@ from config.settings import (
 )
 
 # Configure logging
+# Records are written in batches rather than one write per record
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[BufferedStreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
 
+# Process-wide queue listener, started by the first job (see _ensure_queue_logging)
+_log_listener = None
+_log_listener_lock = threading.Lock()
+
+
+def _start_queue_logging() -> logging.handlers.QueueListener:
+    """
+    Move log emission off the event loop.
+    
+    The root logger's handlers are handed to a background QueueListener
+    thread and replaced with a single QueueHandler, so log calls on the
+    turn path only enqueue the record instead of writing to stdout.
+    
+    Returns:
+        The started listener (pass to _stop_queue_logging when done)
+    """
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *root.handlers, respect_handler_level=True
+    )
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
+def _ensure_queue_logging():
+    """
+    Install the queue listener once per process.
+    
+    Jobs may run concurrently in one process (thread executor), so the
+    listener is shared by all of them and only stopped at process exit,
+    never by an individual job.
+    """
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is None:
+            _log_listener = _start_queue_logging()
+            atexit.register(_stop_queue_logging, _log_listener)
+
+
+def _stop_queue_logging(listener: logging.handlers.QueueListener):
+    """Flush queued records and restore the original root handlers."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+    logging.getLogger().handlers = list(listener.handlers)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_vad():
+    """
+    Load the Silero VAD model once per worker process.
+    
+    The model is read-only, so a single instance is shared by every job
+    instead of being reloaded for each new room.
+    """
+    return silero.VAD.load()
+
+
 async def entrypoint(ctx: JobContext):
     """
     Main entrypoint for LiveKit agent job.
@@ -33,6 +101,8 @@ async def entrypoint(ctx: JobContext):
     Args:
         ctx: Job context containing room and connection information
     """
+    _ensure_queue_logging()
+    
     logger.info("=" * 60)
     logger.info("JOB ASSIGNED - Interview agent connecting to room...")
     logger.info(f"Job ID: {ctx.job.id}")
@@ -55,7 +125,7 @@ async def entrypoint(ctx: JobContext):
         from livekit.agents import AgentSession
         
         session = AgentSession(
-            vad=silero.VAD.load(),
+            vad=_get_vad(),
             stt=assemblyai.STT() if ASSEMBLYAI_API_KEY else openai.STT(),
             llm=openai.LLM(model=LLM_MODEL),
             tts=openai.TTS(voice=TTS_VOICE),
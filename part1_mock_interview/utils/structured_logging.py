@@ -1,10 +1,121 @@
 """Structured logging utilities for the interview agent."""
 import logging
-import json
-from typing import Dict, Any, Optional
+import sys
+import threading
+import time
+import orjson
+from collections import deque
+from collections.abc import Mapping
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 
+def _json_default(obj: Any) -> Any:
+    """Serialize types orjson doesn't handle natively (read-only views, deques)."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (deque, set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Event names emitted on every turn
+_EV_USER = sys.intern("user_speech")
+_EV_AGENT = sys.intern("agent_speech")
+_EV_TRANSITION = sys.intern("stage_transition")
+_EV_FUNCTION = sys.intern("function_call")
+
+# Maximum characters of a speech message kept in the log preview
+_PREVIEW_CHARS = 100
+
+
+def _preview(message: str) -> str:
+    """Truncate a message for logging, reusing it when already short enough."""
+    return message if len(message) <= _PREVIEW_CHARS else message[:_PREVIEW_CHARS]
+
+
+# Second-granularity ISO prefix, rebuilt at most once per second
+_last_ts_sec = 0
+_last_ts_prefix = ""
+
+
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp with microseconds, without a datetime per event."""
+    global _last_ts_sec, _last_ts_prefix
+    now = time.time()
+    sec = int(now)
+    if sec != _last_ts_sec:
+        _last_ts_prefix = datetime.utcfromtimestamp(sec).strftime("%Y-%m-%dT%H:%M:%S")
+        _last_ts_sec = sec
+    return f"{_last_ts_prefix}.{int((now - sec) * 1_000_000):06d}"
+
+
+def to_json_bytes(obj: Any) -> bytes:
+    """Serialize a value to JSON bytes the same way log events are encoded."""
+    return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTIONS)
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that coalesces formatted records into one write per batch.
+    
+    The buffer is written out when it reaches ``capacity`` records, when a
+    WARNING-or-higher record arrives, or ``flush_interval`` seconds after the
+    first buffered record, whichever comes first.
+    """
+    
+    def __init__(self, stream=None, capacity: int = 64, flush_interval: float = 0.2):
+        """
+        Initialize buffered handler.
+        
+        Args:
+            stream: Output stream (defaults to sys.stderr)
+            capacity: Number of records that triggers a flush
+            flush_interval: Maximum seconds a record may sit in the buffer
+        """
+        super().__init__(stream)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._timer: Optional[threading.Timer] = None
+    
+    def emit(self, record: logging.LogRecord):
+        """Buffer a formatted record, flushing if a trigger is hit."""
+        try:
+            self._buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        
+        if len(self._buffer) >= self.capacity or record.levelno >= logging.WARNING:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self):
+        """Write all buffered records with a single write call."""
+        self.acquire()
+        try:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if self._buffer and self.stream:
+                self.stream.write("".join(self._buffer))
+                self._buffer.clear()
+            super().flush()
+        finally:
+            self.release()
+    
+    def close(self):
+        """Flush remaining records before closing."""
+        self.flush()
+        super().close()
+
+
 class StructuredLogger:
     """Structured logger that outputs JSON-formatted logs."""
     
@@ -18,11 +129,28 @@ class StructuredLogger:
         """
         self.logger = logger or logging.getLogger(name)
         self.session_id: Optional[str] = None
+        # Fields attached to every event emitted by this logger (see bind)
+        self._context: Dict[str, Any] = {}
         
     def set_session_id(self, session_id: str):
         """Set session ID for all subsequent logs."""
         self.session_id = session_id
     
+    def bind(self, **fields) -> "StructuredLogger":
+        """
+        Return a logger that adds the given fields to every event.
+        
+        Args:
+            **fields: Context fields to pre-bind (e.g. stage)
+            
+        Returns:
+            New StructuredLogger sharing this one's logger and session ID
+        """
+        bound = StructuredLogger(self.logger.name, self.logger)
+        bound.session_id = self.session_id
+        bound._context = {**self._context, **fields}
+        return bound
+    
     def _log(self, level: int, event: str, **kwargs):
         """
         Log structured event.
@@ -32,21 +160,61 @@ class StructuredLogger:
             event: Event name/type
             **kwargs: Additional context data
         """
+        # Skip building and encoding events the logger would drop anyway
+        if not self.logger.isEnabledFor(level):
+            return
+        
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_timestamp(),
             "event": event,
-            "session_id": self.session_id,
-            **kwargs
+            "session_id": self.session_id
         }
+        # Fixed keys first; merge the optional tails only when present
+        if self._context:
+            log_data.update(self._context)
+        if kwargs:
+            log_data.update(kwargs)
         
-        # Output as JSON for structured logging
-        message = json.dumps(log_data, default=str)
+        # Output as JSON for structured logging (orjson is a C encoder, much
+        # faster than stdlib json on the per-turn speech/function-call path)
+        message = to_json_bytes(log_data).decode()
         self.logger.log(level, message)
     
+    def _log_raw(self, level: int, event: str, payloads: Dict[str, bytes]):
+        """
+        Log structured event whose extra fields are already JSON-encoded.
+        
+        The payload bytes are spliced into the event as-is instead of being
+        passed through the kwargs merge and re-serialized.
+        
+        Args:
+            level: Logging level
+            event: Event name/type
+            payloads: Field name -> pre-serialized JSON bytes (see to_json_bytes)
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        
+        header = to_json_bytes({
+            "timestamp": _utc_timestamp(),
+            "event": event,
+            "session_id": self.session_id,
+            **self._context
+        })
+        parts = [header[:-1]]
+        for key, payload in payloads.items():
+            parts.append(b"," + orjson.dumps(key) + b":" + payload)
+        parts.append(b"}")
+        self.logger.log(level, b"".join(parts).decode())
+    
     def info(self, event: str, **kwargs):
         """Log info level event."""
         self._log(logging.INFO, event, **kwargs)
     
+    def info_raw(self, event: str, **payloads: bytes):
+        """Log info level event with pre-serialized JSON fields."""
+        self._log_raw(logging.INFO, event, payloads)
+    
     def warning(self, event: str, **kwargs):
         """Log warning level event."""
         self._log(logging.WARNING, event, **kwargs)
@@ -63,7 +231,7 @@ class StructuredLogger:
                         time_in_stage: float, **kwargs):
         """Log stage transition event."""
         self.info(
-            "stage_transition",
+            _EV_TRANSITION,
             from_stage=from_stage,
             to_stage=to_stage,
             reason=reason,
@@ -71,33 +239,30 @@ class StructuredLogger:
             **kwargs
         )
     
-    def user_speech(self, message: str, stage: str, **kwargs):
+    def user_speech(self, message: str, **kwargs):
         """Log user speech event."""
         self.info(
-            "user_speech",
-            message_preview=message[:100],
-            stage=stage,
+            _EV_USER,
+            message_preview=_preview(message),
             message_length=len(message),
             **kwargs
         )
     
-    def agent_speech(self, message: str, stage: str, **kwargs):
+    def agent_speech(self, message: str, **kwargs):
         """Log agent speech event."""
         self.info(
-            "agent_speech",
-            message_preview=message[:100],
-            stage=stage,
+            _EV_AGENT,
+            message_preview=_preview(message),
             message_length=len(message),
             **kwargs
         )
     
-    def function_call(self, function_name: str, args: Dict[str, Any], stage: str, **kwargs):
+    def function_call(self, function_name: str, args: Dict[str, Any], **kwargs):
         """Log function call event."""
         self.info(
-            "function_call",
+            _EV_FUNCTION,
             function_name=function_name,
             function_args=args,
-            stage=stage,
             **kwargs
         )
     
@@ -111,13 +276,12 @@ class StructuredLogger:
             **kwargs
         )
     
-    def error_event(self, error_type: str, error_message: str, stage: str, **kwargs):
+    def error_event(self, error_type: str, error_message: str, **kwargs):
         """Log error event."""
         self.error(
             "error_occurred",
             error_type=error_type,
             error_message=error_message,
-            stage=stage,
             **kwargs
         )
 
@@ -1,25 +1,77 @@
 """Browser management for Playwright."""
+import asyncio
+import inspect
 import logging
 import os
 from pathlib import Path
+from typing import Optional
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from automation.captcha_bridge import start_bridge_server, stop_bridge_server
+from utils.config import PW_INSPECT_STACK
 
 logger = logging.getLogger(__name__)
 
 
+class _NoStackInspect:
+    """inspect module stand-in whose stack() skips the frame walk."""
+    
+    def __getattr__(self, name):
+        return getattr(inspect, name)
+    
+    @staticmethod
+    def stack(*args, **kwargs):
+        return []
+
+
+def _disable_playwright_stack_capture():
+    """Stop Playwright from walking the caller's stack on every API call.
+    
+    Playwright records the calling frames for its tracing feature, which
+    costs a large share of CPU when many calls are made. The frames are
+    unused here, so capture is replaced with an empty result. Error
+    messages lose their "Page.goto: " style prefix as a side effect.
+    """
+    try:
+        from playwright._impl import _connection
+    except ImportError:
+        return
+    
+    if hasattr(_connection, "_capture_stack_trace"):
+        # Newer releases walk frames in _capture_stack_trace
+        _connection._capture_stack_trace = lambda: {"frames": [], "apiName": "", "title": None}
+    elif hasattr(_connection, "inspect"):
+        # Older releases call inspect.stack() directly in wrap_api_call
+        _connection.inspect = _NoStackInspect()
+
+
+if not PW_INSPECT_STACK:
+    _disable_playwright_stack_capture()
+
+# CAPTCHA solver extension directory, resolved once at import
+_EXT_PATH = (Path(__file__).resolve().parent.parent / "chrome_extension")
+
+_CONTEXT_OPTIONS = {
+    "viewport": {"width": 1280, "height": 900},
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+
 class BrowserManager:
     """Manages Playwright browser instance with Chrome extension."""
     
-    def __init__(self, headless: bool = False, load_extension: bool = True):
+    def __init__(self, headless: bool = False, load_extension: bool = True,
+                 storage_state_path: Optional[str] = None):
         """Initialize browser manager.
         
         Args:
             headless: Run browser in headless mode
             load_extension: Whether to load the CAPTCHA solver extension
+            storage_state_path: File to load cookies/localStorage from and save
+                them back to when a context closes (e.g. dismissed cookie banners)
         """
         self.headless = headless
         self.load_extension = load_extension
+        self.storage_state_path = storage_state_path
         self.playwright = None
         self.browser: Browser = None
         self.context: BrowserContext = None
@@ -48,15 +100,8 @@ class BrowserManager:
         ]
         
         # Load Chrome extension if enabled
-        context_options = {
-            "viewport": {"width": 1280, "height": 900},
-            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
-        
         if self.load_extension:
-            # Get extension path
-            extension_path = Path(__file__).parent.parent / "chrome_extension"
-            extension_path = extension_path.resolve()
+            extension_path = _EXT_PATH
             
             if extension_path.exists():
                 launch_args.append(f"--disable-extensions-except={extension_path}")
@@ -71,28 +116,63 @@ class BrowserManager:
             args=launch_args
         )
         
-        self.context = await self.browser.new_context(**context_options)
+        self.context = await self.new_context()
         self.page = await self.context.new_page()
         self.page.set_default_timeout(30000)
         logger.info("Browser started")
     
+    async def new_context(self) -> BrowserContext:
+        """Create an isolated context on the running browser.
+        
+        Lets one launched browser serve several applications, each with its
+        own cookies and storage.
+        
+        Returns:
+            New browser context with the standard viewport and user agent
+        """
+        if not self.browser:
+            raise RuntimeError("Browser not started. Call start() first.")
+        if self.storage_state_path and os.path.exists(self.storage_state_path):
+            return await self.browser.new_context(storage_state=self.storage_state_path, **_CONTEXT_OPTIONS)
+        return await self.browser.new_context(**_CONTEXT_OPTIONS)
+    
+    async def close_context(self, context: BrowserContext):
+        """Save the context's storage state (if configured) and close it.
+        
+        Args:
+            context: Context created by new_context()
+        """
+        if self.storage_state_path:
+            try:
+                await context.storage_state(path=self.storage_state_path)
+            except Exception as e:
+                logger.warning(f"Could not save storage state: {e}")
+        await context.close()
+    
     async def close(self):
         """Close browser and cleanup."""
+        # The bridge server is independent of the browser, so stop it while
+        # the browser tears down instead of after
+        shutdowns = [self._close_browser()]
+        if self.bridge_server:
+            shutdowns.append(stop_bridge_server())
+        
+        browser_result, *bridge_result = await asyncio.gather(*shutdowns, return_exceptions=True)
+        if bridge_result and isinstance(bridge_result[0], Exception):
+            logger.warning(f"Error stopping bridge server: {bridge_result[0]}")
+        if isinstance(browser_result, Exception):
+            raise browser_result
+        
+        logger.info("Browser closed")
+    
+    async def _close_browser(self):
+        """Close the context and browser, then stop Playwright."""
         if self.context:
-            await self.context.close()
+            await self.close_context(self.context)
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
-        
-        # Stop bridge server
-        if self.bridge_server:
-            try:
-                await stop_bridge_server()
-            except Exception as e:
-                logger.warning(f"Error stopping bridge server: {e}")
-        
-        logger.info("Browser closed")
     
     def get_page(self) -> Page:
         """Get the current page."""
@@ -1,12 +1,13 @@
 """HTTP bridge server for Chrome extension to communicate with Python CAPTCHA solver."""
 import logging
 import asyncio
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
 from typing import Optional
+from urllib.parse import parse_qs
+import msgspec
 import uvicorn
-from automation.captcha_solver import CaptchaSolver
+from automation.captcha_solver import CaptchaSolver, resolve_pingback
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +25,15 @@ app.add_middleware(
 # Initialize solver
 solver = CaptchaSolver()
 
+# captcha_type -> coroutine factory, so /solve dispatches with one lookup
+_SOLVERS = {
+    "recaptcha_v2": lambda r: solver.solve_recaptcha_v2(r.site_key, r.page_url),
+    "recaptcha_v3": lambda r: solver.solve_recaptcha_v3(r.site_key, r.page_url, r.action or "submit"),
+    "hcaptcha": lambda r: solver.solve_hcaptcha(r.site_key, r.page_url),
+}
 
-class SolveRequest(BaseModel):
+
+class SolveRequest(msgspec.Struct):
     """Request model for CAPTCHA solving."""
     captcha_type: str  # recaptcha_v2, recaptcha_v3, hcaptcha
     site_key: str
@@ -33,71 +41,117 @@ class SolveRequest(BaseModel):
     action: Optional[str] = None  # For reCAPTCHA v3
 
 
-class SolutionResponse(BaseModel):
+class SolutionResponse(msgspec.Struct):
     """Response model for CAPTCHA solution."""
     success: bool
     solution: Optional[str] = None
     error: Optional[str] = None
 
 
+# Static response bodies, built once and reused for every request
+_HEALTH_OK = Response(content=b'{"status":"ok"}', media_type="application/json")
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "ok"}
+    return _HEALTH_OK
 
 
 @app.get("/balance")
 async def get_balance():
     """Get 2Captcha account balance."""
-    balance = solver.get_balance()
+    balance = await solver.get_balance()
     if balance is None:
         raise HTTPException(status_code=500, detail="Failed to get balance")
     return {"balance": balance}
 
 
-@app.post("/solve", response_model=SolutionResponse)
-async def solve_captcha(request: SolveRequest):
+_solve_request_decoder = msgspec.json.Decoder(SolveRequest)
+_solution_encoder = msgspec.json.Encoder()
+
+
+def _solution_response(solution: SolutionResponse) -> Response:
+    """Encode a solution as a JSON response."""
+    return Response(content=_solution_encoder.encode(solution), media_type="application/json")
+
+
+_SOLVE_FAILED_RESP = _solution_response(SolutionResponse(
+    success=False,
+    error="Failed to solve CAPTCHA. Check logs for details."
+))
+
+
+@app.post("/solve")
+async def solve_captcha(http_request: Request):
     """Solve CAPTCHA challenge.
     
     Args:
-        request: CAPTCHA solving request
+        http_request: Raw request whose JSON body is a SolveRequest
     
     Returns:
         Solution token or error
     """
+    try:
+        request = _solve_request_decoder.decode(await http_request.body())
+    except msgspec.DecodeError as e:
+        # msgspec.ValidationError is a DecodeError subclass
+        raise HTTPException(status_code=422, detail=str(e))
+    
     try:
         logger.info(f"Received solve request: type={request.captcha_type}, site_key={request.site_key[:20]}...")
         
         # Solve based on type
-        if request.captcha_type == "recaptcha_v2":
-            solution = solver.solve_recaptcha_v2(request.site_key, request.page_url)
-        elif request.captcha_type == "recaptcha_v3":
-            action = request.action or "submit"
-            solution = solver.solve_recaptcha_v3(request.site_key, request.page_url, action)
-        elif request.captcha_type == "hcaptcha":
-            solution = solver.solve_hcaptcha(request.site_key, request.page_url)
-        else:
-            return SolutionResponse(
+        solve = _SOLVERS.get(request.captcha_type)
+        if solve is None:
+            return _solution_response(SolutionResponse(
                 success=False,
                 error=f"Unsupported CAPTCHA type: {request.captcha_type}"
-            )
+            ))
+        
+        solution = await solve(request)
         
         if solution:
             logger.info("CAPTCHA solved successfully")
-            return SolutionResponse(success=True, solution=solution)
+            return _solution_response(SolutionResponse(success=True, solution=solution))
         else:
             logger.error("Failed to solve CAPTCHA")
-            return SolutionResponse(
-                success=False,
-                error="Failed to solve CAPTCHA. Check logs for details."
-            )
+            return _SOLVE_FAILED_RESP
             
     except Exception as e:
         logger.error(f"Error solving CAPTCHA: {e}", exc_info=True)
-        return SolutionResponse(
+        return _solution_response(SolutionResponse(
             success=False,
             error=str(e)
-        )
+        ))
+
+
+@app.api_route("/captcha/pingback", methods=["GET", "POST"])
+async def captcha_pingback(http_request: Request):
+    """Receive a solved CAPTCHA pushed by 2Captcha.
+    
+    2Captcha sends the task ID and token as ``id`` and ``code``, either as
+    form fields or query parameters.
+    
+    Args:
+        http_request: Raw pingback request
+    
+    Returns:
+        Plain-text acknowledgement
+    """
+    fields = dict(http_request.query_params)
+    body = await http_request.body()
+    if body:
+        fields.update({k: v[0] for k, v in parse_qs(body.decode()).items()})
+    
+    task_id = fields.get("id")
+    solution = fields.get("code")
+    if not task_id or not solution:
+        raise HTTPException(status_code=400, detail="Missing id or code")
+    
+    if not resolve_pingback(task_id, solution):
+        logger.warning(f"Pingback for unknown or finished task {task_id}")
+    return Response(content=b"OK", media_type="text/plain")
 
 
 class BridgeServer:
@@ -122,7 +176,8 @@ class BridgeServer:
             host=self.host,
             port=self.port,
             log_level="info",
-            access_log=False
+            access_log=False,
+            http="httptools"
         )
         self.server = uvicorn.Server(config)
         self.task = asyncio.create_task(self.server.serve())
@@ -134,6 +189,7 @@ class BridgeServer:
             self.server.should_exit = True
         if self.task:
             await self.task
+        await solver.aclose()
         logger.info("CAPTCHA bridge server stopped")
 
 
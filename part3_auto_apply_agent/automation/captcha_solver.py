@@ -1,32 +1,104 @@
 """CAPTCHA solving integration with 2Captcha API."""
+import asyncio
 import logging
 import time
-import requests
-from typing import Optional, Dict, Any
-from utils.config import CAPTCHA_API_KEY, CAPTCHA_SERVICE
+import httpx
+from typing import Optional, Dict, Any, Tuple
+from utils.config import CAPTCHA_API_KEY, CAPTCHA_SERVICE, CAPTCHA_PINGBACK_URL
 
 logger = logging.getLogger(__name__)
 
+# 2Captcha in.php parameters per CAPTCHA type; the shared key/json fields
+# are added by CaptchaSolver._submit_and_poll
+_CAPTCHA_PARAMS = {
+    "recaptcha_v2": lambda sk, url, **k: {"method": "userrecaptcha", "googlekey": sk, "pageurl": url},
+    "recaptcha_v3": lambda sk, url, action="submit", **k: {
+        "method": "userrecaptcha", "version": "v3", "googlekey": sk, "pageurl": url, "action": action
+    },
+    "hcaptcha": lambda sk, url, **k: {"method": "hcaptcha", "sitekey": sk, "pageurl": url},
+}
+
+_CAPTCHA_LABELS = {
+    "recaptcha_v2": "reCAPTCHA v2",
+    "recaptcha_v3": "reCAPTCHA v3",
+    "hcaptcha": "hCaptcha",
+}
+
+_CAPTCHA_ALIASES = {"recaptcha2": "recaptcha_v2", "recaptcha3": "recaptcha_v3"}
+
+# Task ID -> future awaiting a 2Captcha pingback. Module-level so the bridge
+# endpoint can resolve tasks submitted by any solver instance in the process.
+_pingback_waiters: Dict[str, asyncio.Future] = {}
+
+
+def resolve_pingback(task_id: str, solution: str) -> bool:
+    """Deliver a pingback solution to the solver waiting on it.
+    
+    Args:
+        task_id: 2Captcha task ID from the pingback
+        solution: Solution token from the pingback
+    
+    Returns:
+        True if a solver was waiting for this task
+    """
+    future = _pingback_waiters.pop(task_id, None)
+    if future is None or future.done():
+        return False
+    future.set_result(solution)
+    return True
+
 
 class CaptchaSolver:
     """Handles CAPTCHA solving via 2Captcha API."""
     
-    API_BASE_URL = "http://2captcha.com"
+    API_BASE_URL = "https://2captcha.com"
+    
+    # 2Captcha rarely has a token before ~15s, so wait that long before the
+    # first poll; the interval between polls then grows by POLL_BACKOFF from
+    # POLL_INTERVAL up to MAX_POLL_INTERVAL
+    INITIAL_POLL_DELAY = 15
+    POLL_INTERVAL = 5
+    POLL_BACKOFF = 1.5
+    MAX_POLL_INTERVAL = 20
+    
+    # How long to wait for a pingback before falling back to polling
+    PINGBACK_WAIT = 60
     
-    def __init__(self, api_key: Optional[str] = None, service: str = "2captcha"):
+    def __init__(self, api_key: Optional[str] = None, service: str = "2captcha",
+                 pingback_url: Optional[str] = None):
         """Initialize CAPTCHA solver.
         
         Args:
             api_key: 2Captcha API key (defaults to config)
             service: CAPTCHA service provider (defaults to 2captcha)
+            pingback_url: Public pingback URL (defaults to config; empty disables pingback)
         """
         self.api_key = api_key or CAPTCHA_API_KEY
         self.service = service or CAPTCHA_SERVICE
+        self.pingback_url = pingback_url or CAPTCHA_PINGBACK_URL
+        # Shared pooled client, created lazily on first async use
+        self._client: Optional[httpx.AsyncClient] = None
+        # (type, site_key, page_url) -> solve in progress, so concurrent
+        # requests for the same page share one paid submission
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
         
         if not self.api_key:
             logger.warning("No CAPTCHA API key provided. CAPTCHA solving will be disabled.")
     
-    def get_balance(self) -> Optional[float]:
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            # HTTP/2 is only negotiated over TLS, hence the https base URL
+            self._client = httpx.AsyncClient(base_url=self.API_BASE_URL, http2=True, timeout=30)
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def get_balance(self) -> Optional[float]:
         """Check 2Captcha account balance.
         
         Returns:
@@ -36,8 +108,8 @@ class CaptchaSolver:
             return None
         
         try:
-            response = requests.get(
-                f"{self.API_BASE_URL}/res.php",
+            response = await self._get_client().get(
+                "/res.php",
                 params={
                     "key": self.api_key,
                     "action": "getbalance"
@@ -47,16 +119,16 @@ class CaptchaSolver:
             
             if response.status_code == 200:
                 balance = float(response.text)
-                logger.info(f"2Captcha balance: ${balance:.2f}")
+                logger.info("2Captcha balance: $%.2f", balance)
                 return balance
             else:
-                logger.error(f"Failed to get balance: {response.text}")
+                logger.error("Failed to get balance: %s", response.text)
                 return None
         except Exception as e:
-            logger.error(f"Error checking balance: {e}")
+            logger.error("Error checking balance: %s", e)
             return None
     
-    def solve_recaptcha_v2(self, site_key: str, page_url: str, timeout: int = 120) -> Optional[str]:
+    async def solve_recaptcha_v2(self, site_key: str, page_url: str, timeout: int = 120) -> Optional[str]:
         """Solve reCAPTCHA v2.
         
         Args:
@@ -67,41 +139,11 @@ class CaptchaSolver:
         Returns:
             Solution token, or None if failed
         """
-        if not self.api_key:
-            logger.error("No CAPTCHA API key configured")
-            return None
-        
-        logger.info(f"Solving reCAPTCHA v2 for site_key: {site_key[:20]}...")
-        
-        # Submit CAPTCHA to 2Captcha
-        submit_url = f"{self.API_BASE_URL}/in.php"
-        submit_params = {
-            "key": self.api_key,
-            "method": "userrecaptcha",
-            "googlekey": site_key,
-            "pageurl": page_url,
-            "json": 1
-        }
-        
-        try:
-            response = requests.post(submit_url, data=submit_params, timeout=30)
-            result = response.json()
-            
-            if result.get("status") != 1:
-                logger.error(f"Failed to submit CAPTCHA: {result.get('request')}")
-                return None
-            
-            task_id = result.get("request")
-            logger.info(f"CAPTCHA submitted. Task ID: {task_id}")
-            
-            # Poll for solution
-            return self._poll_for_solution(task_id, timeout)
-            
-        except Exception as e:
-            logger.error(f"Error solving reCAPTCHA v2: {e}")
-            return None
+        return await self._submit_and_poll(
+            "reCAPTCHA v2", site_key, _CAPTCHA_PARAMS["recaptcha_v2"](site_key, page_url), timeout
+        )
     
-    def solve_recaptcha_v3(self, site_key: str, page_url: str, action: str = "submit", timeout: int = 120) -> Optional[str]:
+    async def solve_recaptcha_v3(self, site_key: str, page_url: str, action: str = "submit", timeout: int = 120) -> Optional[str]:
         """Solve reCAPTCHA v3.
         
         Args:
@@ -113,41 +155,11 @@ class CaptchaSolver:
         Returns:
             Solution token, or None if failed
         """
-        if not self.api_key:
-            logger.error("No CAPTCHA API key configured")
-            return None
-        
-        logger.info(f"Solving reCAPTCHA v3 for site_key: {site_key[:20]}...")
-        
-        submit_url = f"{self.API_BASE_URL}/in.php"
-        submit_params = {
-            "key": self.api_key,
-            "method": "userrecaptcha",
-            "version": "v3",
-            "googlekey": site_key,
-            "pageurl": page_url,
-            "action": action,
-            "json": 1
-        }
-        
-        try:
-            response = requests.post(submit_url, data=submit_params, timeout=30)
-            result = response.json()
-            
-            if result.get("status") != 1:
-                logger.error(f"Failed to submit CAPTCHA: {result.get('request')}")
-                return None
-            
-            task_id = result.get("request")
-            logger.info(f"CAPTCHA submitted. Task ID: {task_id}")
-            
-            return self._poll_for_solution(task_id, timeout)
-            
-        except Exception as e:
-            logger.error(f"Error solving reCAPTCHA v3: {e}")
-            return None
+        return await self._submit_and_poll(
+            "reCAPTCHA v3", site_key, _CAPTCHA_PARAMS["recaptcha_v3"](site_key, page_url, action=action), timeout
+        )
     
-    def solve_hcaptcha(self, site_key: str, page_url: str, timeout: int = 120) -> Optional[str]:
+    async def solve_hcaptcha(self, site_key: str, page_url: str, timeout: int = 120) -> Optional[str]:
         """Solve hCaptcha.
         
         Args:
@@ -158,39 +170,101 @@ class CaptchaSolver:
         Returns:
             Solution token, or None if failed
         """
+        return await self._submit_and_poll(
+            "hCaptcha", site_key, _CAPTCHA_PARAMS["hcaptcha"](site_key, page_url), timeout
+        )
+    
+    async def _submit_and_poll(self, label: str, site_key: str, params: Dict[str, Any], timeout: int = 120) -> Optional[str]:
+        """Submit a CAPTCHA task to 2Captcha and poll for its solution.
+        
+        Concurrent calls for the same CAPTCHA on the same page wait on the
+        first call's result instead of submitting again. Nothing is kept once
+        the solve finishes, since tokens expire within minutes.
+        
+        Args:
+            label: Human-readable CAPTCHA name for log messages
+            site_key: CAPTCHA site key
+            params: Method-specific submit parameters (from _CAPTCHA_PARAMS)
+            timeout: Maximum time to wait for solution (seconds)
+        
+        Returns:
+            Solution token, or None if failed
+        """
+        key = (label, site_key, params.get("pageurl", ""))
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            logger.info("Joining in-flight %s solve for site_key: %.20s...", label, site_key)
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        solution = None
+        try:
+            solution = await self._submit_and_poll_once(label, site_key, params, timeout)
+            return solution
+        finally:
+            del self._inflight[key]
+            future.set_result(solution)
+    
+    async def _submit_and_poll_once(self, label: str, site_key: str, params: Dict[str, Any], timeout: int = 120) -> Optional[str]:
+        """Submit a single CAPTCHA task and wait for its solution (see _submit_and_poll)."""
         if not self.api_key:
             logger.error("No CAPTCHA API key configured")
             return None
         
-        logger.info(f"Solving hCaptcha for site_key: {site_key[:20]}...")
+        logger.info("Solving %s for site_key: %.20s...", label, site_key)
         
-        submit_url = f"{self.API_BASE_URL}/in.php"
-        submit_params = {
-            "key": self.api_key,
-            "method": "hcaptcha",
-            "sitekey": site_key,
-            "pageurl": page_url,
-            "json": 1
-        }
+        submit_params = {"key": self.api_key, **params, "json": 1}
+        if self.pingback_url:
+            submit_params["pingback"] = self.pingback_url
         
         try:
-            response = requests.post(submit_url, data=submit_params, timeout=30)
+            response = await self._get_client().post("/in.php", data=submit_params)
             result = response.json()
             
             if result.get("status") != 1:
-                logger.error(f"Failed to submit CAPTCHA: {result.get('request')}")
+                logger.error("Failed to submit CAPTCHA: %s", result.get("request"))
                 return None
             
             task_id = result.get("request")
-            logger.info(f"CAPTCHA submitted. Task ID: {task_id}")
+            logger.info("CAPTCHA submitted. Task ID: %s", task_id)
+            
+            if self.pingback_url:
+                return await self._wait_for_pingback(task_id, timeout)
             
-            return self._poll_for_solution(task_id, timeout)
+            # Poll for solution
+            return await self._poll_for_solution(task_id, timeout)
             
         except Exception as e:
-            logger.error(f"Error solving hCaptcha: {e}")
+            logger.error("Error solving %s: %s", label, e)
             return None
     
-    def _poll_for_solution(self, task_id: str, timeout: int = 120) -> Optional[str]:
+    async def _wait_for_pingback(self, task_id: str, timeout: int = 120) -> Optional[str]:
+        """Wait for 2Captcha to push the solution, polling if it doesn't arrive.
+        
+        Args:
+            task_id: Task ID returned from submission
+            timeout: Maximum time to wait (seconds)
+        
+        Returns:
+            Solution token, or None if failed
+        """
+        future = asyncio.get_running_loop().create_future()
+        _pingback_waiters[task_id] = future
+        wait = min(self.PINGBACK_WAIT, timeout)
+        
+        try:
+            solution = await asyncio.wait_for(future, wait)
+            logger.info("CAPTCHA solved successfully (pingback)!")
+            return solution
+        except asyncio.TimeoutError:
+            logger.warning("No pingback for task %s after %ss, falling back to polling", task_id, wait)
+        finally:
+            _pingback_waiters.pop(task_id, None)
+        
+        return await self._poll_for_solution(task_id, timeout - wait)
+    
+    async def _poll_for_solution(self, task_id: str, timeout: int = 120) -> Optional[str]:
         """Poll 2Captcha API for solution.
         
         Args:
@@ -200,15 +274,22 @@ class CaptchaSolver:
         Returns:
             Solution token, or None if failed
         """
-        get_url = f"{self.API_BASE_URL}/res.php"
-        start_time = time.time()
-        poll_interval = 5  # Poll every 5 seconds
+        get_url = "/res.php"
+        client = self._get_client()
+        deadline = time.monotonic() + timeout
+        attempt = 0
+        poll_interval = self.POLL_INTERVAL
         
-        logger.info(f"Polling for solution (timeout: {timeout}s)...")
+        logger.info("Polling for solution (timeout: %ss)...", timeout)
+        await asyncio.sleep(min(self.INITIAL_POLL_DELAY, timeout))
         
-        while time.time() - start_time < timeout:
+        # Always poll at least once, even if the initial wait used up the timeout
+        while attempt == 0 or time.monotonic() < deadline:
+            if attempt:
+                poll_interval = min(poll_interval * self.POLL_BACKOFF, self.MAX_POLL_INTERVAL)
+            attempt += 1
             try:
-                response = requests.get(
+                response = await client.get(
                     get_url,
                     params={
                         "key": self.api_key,
@@ -230,23 +311,28 @@ class CaptchaSolver:
                     # Still processing
                     if "CAPCHA_NOT_READY" in result.get("request", ""):
                         logger.debug("CAPTCHA not ready yet, waiting...")
-                        time.sleep(poll_interval)
+                        await self._sleep_until_next_poll(poll_interval, deadline)
                         continue
                     else:
-                        logger.error(f"CAPTCHA solving failed: {result.get('request')}")
+                        logger.error("CAPTCHA solving failed: %s", result.get("request"))
                         return None
                 else:
-                    logger.error(f"Unexpected response: {result}")
+                    logger.error("Unexpected response: %s", result)
                     return None
                     
             except Exception as e:
-                logger.warning(f"Error polling for solution: {e}, retrying...")
-                time.sleep(poll_interval)
+                logger.warning("Error polling for solution: %s, retrying...", e)
+                await self._sleep_until_next_poll(poll_interval, deadline)
         
-        logger.error(f"Timeout waiting for CAPTCHA solution (>{timeout}s)")
+        logger.error("Timeout waiting for CAPTCHA solution (>%ss)", timeout)
         return None
     
-    def solve_by_type(self, captcha_type: str, site_key: str, page_url: str, **kwargs) -> Optional[str]:
+    @staticmethod
+    async def _sleep_until_next_poll(poll_interval: float, deadline: float):
+        """Sleep for the poll interval, but never past the deadline."""
+        await asyncio.sleep(max(0, min(poll_interval, deadline - time.monotonic())))
+    
+    async def solve_by_type(self, captcha_type: str, site_key: str, page_url: str, **kwargs) -> Optional[str]:
         """Solve CAPTCHA by type.
         
         Args:
@@ -258,16 +344,13 @@ class CaptchaSolver:
         Returns:
             Solution token, or None if failed
         """
-        captcha_type = captcha_type.lower()
-        
-        if captcha_type == "recaptcha_v2" or captcha_type == "recaptcha2":
-            return self.solve_recaptcha_v2(site_key, page_url, **kwargs)
-        elif captcha_type == "recaptcha_v3" or captcha_type == "recaptcha3":
-            action = kwargs.get("action", "submit")
-            return self.solve_recaptcha_v3(site_key, page_url, action, **kwargs)
-        elif captcha_type == "hcaptcha" or captcha_type == "hcaptcha":
-            return self.solve_hcaptcha(site_key, page_url, **kwargs)
-        else:
-            logger.error(f"Unsupported CAPTCHA type: {captcha_type}")
+        captcha_type = _CAPTCHA_ALIASES.get(captcha_type.lower(), captcha_type.lower())
+        build_params = _CAPTCHA_PARAMS.get(captcha_type)
+        if build_params is None:
+            logger.error("Unsupported CAPTCHA type: %s", captcha_type)
             return None
-
+        
+        timeout = kwargs.pop("timeout", 120)
+        return await self._submit_and_poll(
+            _CAPTCHA_LABELS[captcha_type], site_key, build_params(site_key, page_url, **kwargs), timeout
+        )
@@ -1,148 +1,373 @@
 """Main agent for Lever job applications."""
 import asyncio
+import json
 import logging
-from typing import Dict, Any, Optional
+import mimetypes
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlsplit
 from automation.browser import BrowserManager
-from core.llm_client import LLMClient
+from core.llm_client import LLMClient, build_system_prompt
 from core.form_handler import FormHandler
 from utils.resume import ResumeHelper
+from utils.config import JD_CACHE_PATH
 
 logger = logging.getLogger(__name__)
 
+# Lever page selectors
+_JD_SELECTOR = '[class*="posting-page"] [class*="section-wrapper"]'
+_FORM_SELECTOR = 'form, [class*="application-form"]'
+_COOKIE_SELECTOR = 'button:has-text("Dismiss"), button:has-text("Accept")'
+_APPLY_SUFFIX = "/apply"
+
+# True once the CAPTCHA response field (if any) holds a token
+_CAPTCHA_TOKEN_READY_JS = """
+() => {
+    const field = document.querySelector('[name="g-recaptcha-response"], [name="h-captcha-response"]');
+    return !field || !!field.value;
+}
+"""
+
+# Normalized job URL -> job description, loaded from JD_CACHE_PATH on first use
+_jd_cache: Optional[Dict[str, str]] = None
+
+
+def _normalize_job_url(job_url: str) -> str:
+    """Reduce a posting URL to scheme://host/path without query, slash or /apply."""
+    parts = urlsplit(job_url)
+    path = parts.path.rstrip("/")
+    if path.endswith(_APPLY_SUFFIX):
+        path = path[:-len(_APPLY_SUFFIX)]
+    return f"{parts.scheme}://{parts.netloc}{path}"
+
+
+def _get_jd_cache() -> Dict[str, str]:
+    """Get the job description cache, loading it from disk on first use."""
+    global _jd_cache
+    if _jd_cache is None:
+        _jd_cache = {}
+        if JD_CACHE_PATH and Path(JD_CACHE_PATH).exists():
+            try:
+                with open(JD_CACHE_PATH, "r") as f:
+                    _jd_cache = json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not read job description cache: {e}")
+    return _jd_cache
+
+
+def _cache_job_description(job_url: str, job_description: str):
+    """Store a job description in memory and, if configured, on disk."""
+    cache = _get_jd_cache()
+    cache[_normalize_job_url(job_url)] = job_description
+    if JD_CACHE_PATH:
+        try:
+            with open(JD_CACHE_PATH, "w") as f:
+                json.dump(cache, f)
+        except Exception as e:
+            logger.warning(f"Could not write job description cache: {e}")
+
 
 class LeverJobApplicant:
     """Lever-specific job application agent with LLM support."""
     
-    def __init__(self, resume_data: Dict[str, Any], resume_file_path: Optional[str] = None, headless: bool = False):
-        """Initialize Lever job applicant."""
+    def __init__(self, resume_data: Dict[str, Any], resume_file_path: Optional[str] = None, headless: bool = False,
+                 inspect_on_finish: bool = False, browser_manager: Optional[BrowserManager] = None,
+                 storage_state_path: Optional[str] = None):
+        """Initialize Lever job applicant.
+        
+        Args:
+            resume_data: Parsed resume JSON
+            resume_file_path: Optional path to the resume file to upload
+            headless: Run the browser without a window
+            inspect_on_finish: Keep a visible browser open for 30 seconds after
+                applying so the result can be inspected
+            browser_manager: Already started browser to share across applicants;
+                each apply() then only opens and closes its own context
+            storage_state_path: File persisting cookies/localStorage between
+                applies, so e.g. the cookie banner is only dismissed once
+                (ignored when browser_manager is given; set it there instead)
+        """
         self.resume_data = resume_data
         self.resume_file_path = resume_file_path
-        self.job_description = ""
+        self.inspect_on_finish = inspect_on_finish
         
         # Initialize components
-        self.browser_manager = BrowserManager(headless=headless)
-        self.llm_client = LLMClient()  # Will handle None API key internally
-        self.resume_helper = ResumeHelper(resume_data)
+        self._owns_browser = browser_manager is None
+        self.browser_manager = browser_manager or BrowserManager(
+            headless=headless, storage_state_path=storage_state_path
+        )
+        self.headless = self.browser_manager.headless
+    
+    @cached_property
+    def llm_client(self) -> LLMClient:
+        """LLM client, created on first use."""
+        # Will handle None API key internally
+        return LLMClient(system_prompt=build_system_prompt(self.resume_data))
+    
+    @cached_property
+    def resume_helper(self) -> ResumeHelper:
+        """Resume helper, created on first use."""
+        return ResumeHelper(self.resume_data)
+    
+    @cached_property
+    def resume_file(self) -> Optional[Dict[str, Any]]:
+        """Resume file as an in-memory upload payload, read from disk once.
+        
+        None when there is no resume file or it can't be read; the upload then
+        falls back to the path (and reports the error there).
+        """
+        if not self.resume_file_path:
+            return None
+        path = Path(self.resume_file_path)
+        try:
+            buffer = path.read_bytes()
+        except OSError as e:
+            logger.warning(f"Could not read resume file: {e}")
+            return None
+        mime_type = mimetypes.guess_type(path.name)[0] or "application/pdf"
+        return {"name": path.name, "mimeType": mime_type, "buffer": buffer}
     
     async def apply(self, job_url: str) -> Dict[str, Any]:
         """Apply to a Lever job."""
-        result = {
+        result = self._new_result()
+        
+        context = None
+        try:
+            if self._owns_browser:
+                # Start browser
+                await self.browser_manager.start()
+                context = self.browser_manager.context
+                page = self.browser_manager.get_page()
+            else:
+                # Shared browser: isolate this application in its own context
+                context = await self.browser_manager.new_context()
+                page = await context.new_page()
+                page.set_default_timeout(30000)
+            
+            await self._apply_one(job_url, context, page, result)
+            
+        except Exception as e:
+            logger.error(f"Application failed: {e}")
+            result["errors"].append(str(e))
+        
+        finally:
+            if self.inspect_on_finish and not self.headless:
+                # Keep browser open for inspection
+                logger.info("Keeping browser open for 30 seconds for inspection...")
+                await asyncio.sleep(30)
+            if self._owns_browser:
+                await self.browser_manager.close()
+            elif context:
+                await self.browser_manager.close_context(context)
+        
+        return result
+    
+    async def apply_many(self, job_urls: List[str], concurrency: int = 4) -> List[Dict[str, Any]]:
+        """Apply to several Lever jobs concurrently in one browser.
+        
+        Each application gets its own context; at most ``concurrency`` run at
+        once. The browser is started once (unless shared) and closed at the end.
+        
+        Args:
+            job_urls: Lever job posting URLs
+            concurrency: Maximum number of simultaneous applications
+        
+        Returns:
+            One result dict per URL, in the same order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def apply_in_context(job_url: str) -> Dict[str, Any]:
+            async with semaphore:
+                result = self._new_result()
+                context = None
+                try:
+                    context = await self.browser_manager.new_context()
+                    page = await context.new_page()
+                    page.set_default_timeout(30000)
+                    await self._apply_one(job_url, context, page, result)
+                except Exception as e:
+                    logger.error(f"Application to {job_url} failed: {e}")
+                    result["errors"].append(str(e))
+                finally:
+                    if context:
+                        await self.browser_manager.close_context(context)
+                return result
+        
+        if self._owns_browser:
+            await self.browser_manager.start()
+        try:
+            return list(await asyncio.gather(*(apply_in_context(url) for url in job_urls)))
+        finally:
+            if self._owns_browser:
+                await self.browser_manager.close()
+    
+    @staticmethod
+    def _new_result() -> Dict[str, Any]:
+        """Empty application result."""
+        return {
             "success": False,
             "fields_filled": [],
             "fields_empty": [],
             "errors": []
         }
+    
+    async def _apply_one(self, job_url: str, context, page, result: Dict[str, Any]):
+        """Fill and submit one application in the given context/page.
         
-        try:
-            # Start browser
-            await self.browser_manager.start()
-            page = self.browser_manager.get_page()
-            
-            # Initialize form handler
-            form_handler = FormHandler(
-                page=page,
-                llm_client=self.llm_client,
-                resume_helper=self.resume_helper,
-                resume_data=self.resume_data,
-                resume_file_path=self.resume_file_path,
-                job_description=self.job_description
-            )
-            
-            # First, get the job description from the main job page
-            logger.info(f"Getting job description from: {job_url}")
-            await page.goto(job_url, wait_until="domcontentloaded")
-            await asyncio.sleep(2)
-            
-            # Extract job description
+        Args:
+            job_url: Lever job posting URL
+            context: Browser context the application runs in
+            page: Page to fill the application form in
+            result: Result dict to update
+        """
+        # Initialize form handler
+        form_handler = FormHandler(
+            page=page,
+            llm_client=self.llm_client,
+            resume_helper=self.resume_helper,
+            resume_data=self.resume_data,
+            resume_file_path=self.resume_file_path,
+            job_description="",
+            resume_file=self.resume_file
+        )
+        
+        apply_url = job_url if job_url.endswith(_APPLY_SUFFIX) else job_url + _APPLY_SUFFIX
+        job_description = _get_jd_cache().get(_normalize_job_url(job_url))
+        if job_description:
+            logger.info(f"Using cached job description ({len(job_description)} chars)")
+            await self._open_apply_page(page, apply_url)
+        else:
+            # Load the job description in a second tab while the apply page loads;
+            # the description is only needed once the form handler starts answering
+            jd_page = await context.new_page()
             try:
-                jd_element = await page.query_selector('[class*="posting-page"] [class*="section-wrapper"]')
-                if jd_element:
-                    self.job_description = await jd_element.inner_text()
-                    logger.info(f"Got job description ({len(self.job_description)} chars)")
-                    # Update form handler with job description
-                    form_handler.job_description = self.job_description
-            except:
-                pass
-            
-            # Navigate to apply page
-            apply_url = f"{job_url}/apply" if not job_url.endswith("/apply") else job_url
-            logger.info(f"Navigating to: {apply_url}")
-            await page.goto(apply_url, wait_until="domcontentloaded")
-            await asyncio.sleep(3)  # Wait for page to fully load
-            
+                job_description, _ = await asyncio.gather(
+                    self._fetch_job_description(jd_page, job_url),
+                    self._open_apply_page(page, apply_url)
+                )
+            finally:
+                await jd_page.close()
+            if job_description:
+                _cache_job_description(job_url, job_description)
+        
+        if job_description:
+            # Update form handler with job description (kept per application,
+            # since apply_many runs several on this applicant at once)
+            form_handler.job_description = job_description
+        
+        captcha_task = None
+        upload_task = None
+        try:
             # Dismiss cookie consent if present
             await self._dismiss_cookies(page)
             
             # Fill basic info section (direct from resume)
-            logger.info("=" * 50)
             logger.info("STEP 1: Filling basic info...")
-            logger.info("=" * 50)
             await form_handler.fill_basic_info(result)
             
             # Fill application form section (dropdowns + LLM for complex)
-            logger.info("=" * 50)
             logger.info("STEP 2: Filling application form...")
-            logger.info("=" * 50)
+            
+            # Upload the resume while the application form fills, if the file
+            # input is already on the page
+            if self.resume_file_path and await page.query_selector('input[type="file"]'):
+                logger.info("STEP 3: Uploading resume (alongside form fill)...")
+                upload_task = asyncio.create_task(form_handler.upload_resume(result))
+            
             await form_handler.fill_application_form(result)
             
-            # Upload resume if provided
-            if self.resume_file_path:
-                logger.info("=" * 50)
+            # Solve CAPTCHA (if present) in the background; the external solver
+            # wait overlaps with the upload and verification steps
+            captcha_task = asyncio.create_task(form_handler.solve_captcha())
+            
+            # Upload resume now if the file input only appears later; an upload
+            # already running keeps going through verification
+            if not upload_task and self.resume_file_path:
                 logger.info("STEP 3: Uploading resume...")
-                logger.info("=" * 50)
                 await form_handler.upload_resume(result)
             
-            # VERIFICATION: Check all fields and re-fill empty ones
-            logger.info("=" * 50)
+            # VERIFICATION: Check all fields, re-fill empty ones, then verify
             logger.info("STEP 4: Verifying all fields are filled...")
-            logger.info("=" * 50)
-            await form_handler.verify_and_fill_empty_fields(result)
+            await form_handler.verify_pass(result, max_passes=2)
             
-            # Second verification pass
-            logger.info("=" * 50)
-            logger.info("STEP 5: Final verification...")
-            logger.info("=" * 50)
-            await form_handler.final_verification(result)
+            if upload_task:
+                await upload_task
             
-            # Solve CAPTCHA if present
-            logger.info("Checking for CAPTCHA...")
-            captcha_solved = await form_handler.solve_captcha()
+            # Wait for the CAPTCHA started after STEP 2
+            captcha_solved = await captcha_task
             if not captcha_solved:
                 logger.warning("CAPTCHA solving failed - form may not submit")
                 result["errors"].append("CAPTCHA solving failed")
             
-            # Wait a moment for CAPTCHA solution to be processed
-            await asyncio.sleep(2)
+            # Wait until the solution token is in the form (returns at once when
+            # the page has no CAPTCHA response field)
+            try:
+                await page.wait_for_function(_CAPTCHA_TOKEN_READY_JS, timeout=10000)
+            except Exception:
+                logger.warning("CAPTCHA token not detected in form, continuing")
             
             # Submit the form
             logger.info("Submitting form...")
             await form_handler.submit_form(result)
             
             result["success"] = len(result["errors"]) == 0
-            
+        finally:
+            for task in (captcha_task, upload_task):
+                if task and not task.done():
+                    task.cancel()
+    
+    async def _fetch_job_description(self, page, job_url: str) -> str:
+        """Extract the job description text from the posting page.
+        
+        Args:
+            page: Page to load the posting in
+            job_url: Lever job posting URL
+        
+        Returns:
+            Job description text, or empty string if not found
+        """
+        logger.info(f"Getting job description from: {job_url}")
+        try:
+            # Wait for the whole document to be parsed, so the description
+            # read (and cached) below is complete
+            await page.goto(job_url, wait_until="domcontentloaded")
+            jd_element = await page.wait_for_selector(_JD_SELECTOR, timeout=8000)
+            job_description = await jd_element.inner_text()
         except Exception as e:
-            logger.error(f"Application failed: {e}")
-            result["errors"].append(str(e))
+            logger.warning(f"Could not get job description: {e}")
+            return ""
         
-        finally:
-            # Keep browser open for inspection
-            logger.info("Keeping browser open for 30 seconds for inspection...")
-            await asyncio.sleep(30)
-            await self.browser_manager.close()
+        logger.info(f"Got job description ({len(job_description)} chars)")
+        return job_description
+    
+    async def _open_apply_page(self, page, apply_url: str):
+        """Navigate to the application page and wait for the form to render.
         
-        return result
+        Args:
+            page: Page the form will be filled in
+            apply_url: Lever application URL
+        """
+        logger.info(f"Navigating to: {apply_url}")
+        await page.goto(apply_url, wait_until="domcontentloaded")
+        # Wait for the form to render rather than a fixed delay
+        try:
+            await page.wait_for_selector(_FORM_SELECTOR, timeout=8000)
+        except Exception:
+            logger.warning("Application form did not appear within 8s")
     
     async def _dismiss_cookies(self, page):
         """Dismiss cookie consent dialog."""
+        # The apply page has already waited for the form, so the banner (if
+        # any) is rendered; a miss is just None
+        dismiss_btn = await page.query_selector(_COOKIE_SELECTOR)
+        if not dismiss_btn:
+            return
+        
         try:
-            dismiss_btn = await page.wait_for_selector(
-                'button:has-text("Dismiss"), button:has-text("Accept")',
-                timeout=3000
-            )
-            if dismiss_btn:
-                await dismiss_btn.click()
-                await asyncio.sleep(0.5)
-                logger.info("Dismissed cookie consent")
-        except:
-            pass
-
+            await dismiss_btn.click()
+            await asyncio.sleep(0.5)
+            logger.info("Dismissed cookie consent")
+        except Exception as e:
+            logger.debug(f"Could not dismiss cookie consent: {e}")
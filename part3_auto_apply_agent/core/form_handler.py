@@ -1,27 +1,574 @@
 """Form filling handler for Lever job applications."""
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+import re
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
 from playwright.async_api import Page
 from core.llm_client import LLMClient
 from utils.resume import ResumeHelper
+from utils.config import SLEEP_MULT, SUBMIT_TIMING, SubmitTiming
 
 logger = logging.getLogger(__name__)
 
+# Snapshot of every form item's fill state, evaluated over all 'form li'
+# elements at once so a verification scan is one round-trip instead of
+# several per field. Items are tagged with data-fh-idx so the empty ones can
+# be re-located individually; given a list of indices, only those items are
+# described (the rest come back as null).
+_FIELD_SNAPSHOT_JS = """
+(items, indices) => items.map((li, i) => {
+    if (indices && !indices.includes(i)) return null;
+    li.setAttribute('data-fh-idx', String(i));
+    const text = li.innerText || '';
+    const field = {
+        question: text.split('\\n')[0].trim(),
+        required: text.includes('✱') || text.includes('*'),
+        has_dropdown: !!li.querySelector('[role="combobox"], select'),
+        kind: null,
+        filled: true,
+        dropdown_text: ''
+    };
+    
+    const textInput = li.querySelector('input[type="text"], textarea');
+    if (textInput) {
+        field.kind = 'text';
+        field.filled = (textInput.value || '').trim() !== '';
+        return field;
+    }
+    
+    const dropdown = li.querySelector('[role="combobox"], select');
+    if (dropdown) {
+        field.kind = 'dropdown';
+        field.dropdown_text = dropdown.innerText || '';
+        field.filled = isDropdownFilled(dropdown);
+        return field;
+    }
+    
+    const radios = li.querySelectorAll('input[type="radio"]');
+    if (radios.length > 1) {
+        field.kind = 'radio';
+        field.filled = Array.from(radios).some((r) => r.checked);
+        return field;
+    }
+    
+    const checkbox = li.querySelector('input[type="checkbox"]');
+    if (checkbox) {
+        field.kind = 'checkbox';
+        field.filled = checkbox.checked;
+    }
+    return field;
+    
+    function isDropdownFilled(el) {
+        // For select elements, check if a real option is selected
+        if (el.tagName === 'SELECT') {
+            return el.selectedIndex > 0 && el.value && el.value !== '' && el.value !== 'Select';
+        }
+        
+        // For combobox (Lever style), check the value input, which may sit
+        // beside the combobox rather than inside it
+        const input = el.querySelector('input[type="text"], input[type="hidden"]') ||
+            li.querySelector('input[type="hidden"]');
+        if (input) {
+            const trimmed = (input.value || input.getAttribute('value') || '').trim();
+            if (trimmed && trimmed.length > 2 && !trimmed.toLowerCase().includes('select')) {
+                return true;
+            }
+        }
+        
+        // Check for selected option visible
+        const selectedOption = el.querySelector('[aria-selected="true"], .selected, option[selected]');
+        if (selectedOption && selectedOption.textContent) {
+            const optionText = selectedOption.textContent.trim();
+            if (optionText && optionText.length > 2 && !optionText.toLowerCase().includes('select')) {
+                return true;
+            }
+        }
+        
+        // A single visible line that isn't "Select" is probably a chosen value
+        const lines = (el.textContent || el.innerText || '').trim().split('\\n').filter((l) => l.trim());
+        if (lines.length <= 2) {
+            const firstLine = lines[0] ? lines[0].trim() : '';
+            if (firstLine && firstLine.length > 2 &&
+                !firstLine.toLowerCase().startsWith('select') &&
+                !firstLine.toLowerCase().includes('select...')) {
+                return true;
+            }
+        }
+        
+        return false;
+    }
+})
+"""
+
+
+# Autocomplete suggestion items and their container (location field)
+_SUGGESTION_SELECTOR = '[role="option"], [class*="dropdown"] li, [class*="dropdown-results"] > div'
+_SUGGESTION_LIST_SELECTOR = '[role="listbox"], [class*="dropdown-menu"], [class*="dropdown-results"]'
+
+# True once a dropdown is open (aria-expanded or options rendered)
+_DROPDOWN_OPEN_JS = "el => el.getAttribute('aria-expanded') === 'true' || !!document.querySelector('[role=\"option\"]')"
+
+# True once a dropdown has closed after a selection
+_DROPDOWN_CLOSED_JS = "el => el.getAttribute('aria-expanded') !== 'true'"
+
+# [index, text] of each non-placeholder option among the matched elements
+_OPTION_TEXTS_JS = """
+(els) => els
+    .map((e, i) => [i, (e.innerText || '').trim()])
+    .filter(([i, t]) => t && t !== 'Select...' && t !== 'Select')
+"""
+
+# Option labels of a native <select> and the currently selected one ('' when
+# only the placeholder is selected)
+_NATIVE_SELECT_JS = """
+(el) => {
+    const isPlaceholder = (o) => !o.value || /^select/i.test(o.text.trim());
+    const options = Array.from(el.options).filter((o) => !isPlaceholder(o)).map((o) => o.text.trim());
+    const chosen = el.options[el.selectedIndex];
+    return {options, selected: chosen && !isPlaceholder(chosen) ? chosen.text.trim() : ''};
+}
+"""
+
+# Options rendered inside the dropdown element itself
+_INLINE_OPTION_SELECTOR = 'option, [role="option"], div'
+
+# Textareas whose placeholder or aria-label suggests a cover letter
+_COVER_LETTER_TEXTAREA_SELECTOR = ", ".join(
+    f'textarea[{attr}*="{word}" i]' for attr in ("placeholder", "aria-label") for word in ("cover", "letter", "why")
+)
+
+# Keywords matched as substrings of the lowercased question text
+_DIVERSITY_WORDS = frozenset({"ethnicity", "race", "ethnic", "gender", "age bracket", "veteran", "disability", "diversity"})
+_BASIC_LABELS = frozenset({"full name", "email", "phone", "current location", "current company", "resume", "linkedin", "cv"})
+_LINK_WORDS = frozenset({"linkedin", "portfolio", "website", "github"})
+_CONSENT_WORDS = frozenset({"consent", "agree", "accept", "acknowledge"})
+_DIVERSITY_RE = re.compile("|".join(sorted(map(re.escape, _DIVERSITY_WORDS))))
+
+# Option/answer text patterns, matched against lowercased text
+_DECLINE_RE = re.compile(r"prefer not|decline|not to say")
+_PLACEHOLDER_RE = re.compile(r"male|female|select|choose")
+_YES_NO = frozenset(("yes", "no"))
+# Yes/no questions defaulting to "yes" / to "no"
+_YES_QUESTION_RE = re.compile(r"open to|willing|available|interested|able to|authorized")
+_NO_QUESTION_RE = re.compile(r"require|need|visa")
+
+# All keyword sets in one pattern: one optional lookahead group per tag, so a
+# single match() reports every tag whose words occur anywhere in the question
+_QUESTION_TAGS = {
+    "basic": _BASIC_LABELS,
+    "diversity": _DIVERSITY_WORDS,
+    "link": _LINK_WORDS,
+    "consent": _CONSENT_WORDS,
+}
+_QUESTION_TAG_RE = re.compile("".join(
+    f"(?=(?:.*?(?P<{tag}>{'|'.join(sorted(map(re.escape, words)))}))?)"
+    for tag, words in _QUESTION_TAGS.items()
+), re.DOTALL)
+
+
+def _question_tags(q_lower: str) -> set:
+    """Tags (keys of _QUESTION_TAGS) whose keywords occur in a lowercased question."""
+    return {tag for tag, hit in _QUESTION_TAG_RE.match(q_lower).groupdict().items() if hit}
+
+
+# Checkbox label categories auto-checked from preferences, in priority order,
+# with the same one-match lookahead layout as _QUESTION_TAG_RE
+_CHECKBOX_CATEGORIES = ("consent", "terms", "privacy")
+_CHECKBOX_CATEGORY_RE = re.compile(
+    r"(?=(?:.*?(?P<consent>consent|agree|accept|acknowledge|confirm))?)"
+    r"(?=(?:.*?(?P<terms>\bterms\b))?)"
+    r"(?=(?:.*?(?P<privacy>privacy))?)",
+    re.DOTALL
+)
+
+# Every checkbox on the page with its checked state and label text, in
+# document order so the index matches locator('input[type="checkbox"]').nth()
+_CHECKBOX_LABELS_JS = """
+() => Array.from(document.querySelectorAll('input[type="checkbox"]')).map((c, i) => ({
+    i,
+    checked: c.checked,
+    text: (c.closest('label') || c.closest('li') || c.parentElement)?.innerText || ''
+}))
+"""
+
+# Click the checkboxes at the given _CHECKBOX_LABELS_JS indices (if still
+# unchecked) and return the indices that ended up checked
+_CHECK_CHECKBOXES_JS = """
+(indices) => {
+    const checkboxes = document.querySelectorAll('input[type="checkbox"]');
+    return indices.filter((i) => {
+        const checkbox = checkboxes[i];
+        if (!checkbox) return false;
+        if (!checkbox.checked) checkbox.click();
+        return checkbox.checked;
+    });
+}
+"""
+
+# Label text of a radio/checkbox option. Shared by the form schema (whose
+# option lists go to the LLM) and the fillers (which match the LLM's answer
+# against it), so both always see the same text.
+_OPTION_LABEL_JS = """
+    function optionLabel(el) {
+        const label = el.closest('label') || el.parentElement.querySelector('label') || el.parentElement;
+        return label ? (label.innerText || '').trim() : '';
+    }
+""".strip("\n")
+
+# Checked state and label text of each radio in a form item
+_RADIO_OPTIONS_JS = """
+(radios) => {
+""" + _OPTION_LABEL_JS + """
+    
+    return radios.map((el) => ({checked: el.checked, text: optionLabel(el)}));
+}
+"""
+
+# Checked state and label text of each checkbox in an item
+_CHECKBOX_STATES_JS = """
+(boxes) => {
+""" + _OPTION_LABEL_JS + """
+    
+    return boxes.map((el) => ({checked: el.checked, text: optionLabel(el)}));
+}
+"""
+
+# Select a radio by clicking its label (or the radio itself if it has none)
+_CLICK_RADIO_LABEL_JS = "el => (el.closest('label') || el.parentElement.querySelector('label') || el).click()"
+
+# Any element that indicates a CAPTCHA on the page
+_CAPTCHA_SELECTOR = ", ".join([
+    'iframe[src*="captcha"]',
+    'iframe[src*="challenge"]',
+    '[class*="captcha"]',
+    '.g-recaptcha',
+    '.h-captcha',
+    '[data-sitekey]',
+])
+
+# Whether anything matches the CAPTCHA selector (the argument), plus the
+# CAPTCHA type and site key from the widget attributes or its iframe URL
+_CAPTCHA_DETECT_JS = """
+(selector) => {
+    const present = !!document.querySelector(selector);
+    const pageUrl = window.location.href;
+    let captchaType = null;
+    let siteKey = null;
+    
+    // Check for reCAPTCHA v2
+    const recaptchaElement = document.querySelector('.g-recaptcha, [data-sitekey]');
+    if (recaptchaElement) {
+        siteKey = recaptchaElement.getAttribute('data-sitekey');
+        if (siteKey) {
+            captchaType = 'recaptcha_v2';
+        }
+    }
+    
+    // Check for hCaptcha
+    if (!captchaType) {
+        const hcaptchaElement = document.querySelector('.h-captcha');
+        if (hcaptchaElement) {
+            siteKey = hcaptchaElement.getAttribute('data-sitekey');
+            if (siteKey) {
+                captchaType = 'hcaptcha';
+            }
+        }
+    }
+    
+    // Check iframes for site keys
+    if (!siteKey) {
+        const iframes = document.querySelectorAll('iframe[src*="recaptcha"], iframe[src*="hcaptcha"]');
+        iframes.forEach(iframe => {
+            try {
+                const src = iframe.src;
+                if (src.includes('recaptcha')) {
+                    const match = src.match(/[&?]k=([^&]+)/);
+                    if (match) {
+                        siteKey = match[1];
+                        captchaType = 'recaptcha_v2';
+                    }
+                } else if (src.includes('hcaptcha')) {
+                    const match = src.match(/[&?]sitekey=([^&]+)/);
+                    if (match) {
+                        siteKey = match[1];
+                        captchaType = 'hcaptcha';
+                    }
+                }
+            } catch (e) {
+                // Cross-origin
+            }
+        });
+    }
+    
+    return { present, captchaType, siteKey, pageUrl };
+}
+"""
+
+# Ask the solver extension (if loaded) to solve; args: {captchaType, siteKey, pageUrl}
+_EXTENSION_SOLVE_JS = """
+async ({captchaType, siteKey, pageUrl}) => {
+    // Check if extension is available
+    if (window.__captchaDetection) {
+        // Extension detected CAPTCHA, trigger solve
+        return new Promise((resolve) => {
+            chrome.runtime.sendMessage({
+                action: 'solveCaptcha',
+                captchaType,
+                siteKey,
+                pageUrl
+            }, (response) => {
+                resolve(response && response.success);
+            });
+        });
+    }
+    return false;
+}
+"""
+
+# Write a solver token into the CAPTCHA response field; args: {captchaType, solution}
+_INJECT_SOLUTION_JS = """
+({captchaType, solution}) => {
+    const fieldName = {recaptcha_v2: 'g-recaptcha-response', hcaptcha: 'h-captcha-response'}[captchaType];
+    const textarea = fieldName && document.querySelector(`textarea[name="${fieldName}"]`);
+    if (!textarea) return false;
+    textarea.value = solution;
+    textarea.dispatchEvent(new Event('input', { bubbles: true }));
+    return true;
+}
+"""
+
+# Submit button candidates in priority order: generic submit buttons, then
+# Lever's own; buttons labelled "Submit" are tried after these
+_SUBMIT_SELECTORS = [
+    'button[type="submit"]',
+    'button[data-qa="submit"]',
+    'button.postings-btn-template__button',
+    'button.postings-btn',
+]
+
+# Tag the first visible submit candidate with data-auto-submit and return
+# true, or return false if none is visible (hidden hCaptcha buttons skipped)
+_FIND_SUBMIT_JS = """
+(selectors) => {
+    const candidates = selectors.flatMap((sel) => Array.from(document.querySelectorAll(sel)));
+    for (const el of document.querySelectorAll('button')) {
+        if ((el.textContent || '').toLowerCase().includes('submit')) candidates.push(el);
+    }
+    for (const el of candidates) {
+        if (String(el.className).includes('hidden') || el.id.includes('hcaptcha')) continue;
+        // The browser's own visibility check (display/visibility/content-visibility);
+        // older engines fall back to "has a layout box"
+        const visible = typeof el.checkVisibility === 'function'
+            ? el.checkVisibility({checkVisibilityCSS: true})
+            : !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+        if (visible) {
+            el.setAttribute('data-auto-submit', '1');
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+# Texts whose element confirms the application went through (whitespace-
+# normalized exact match of the element's own text, like Playwright's text="...")
+_SUCCESS_TEXTS = ["Thank you", "Application submitted", "success"]
+
+# After submit: the matched success indicator, "url" once the page has left
+# the apply form, or false while neither has happened yet
+_SUBMIT_OUTCOME_JS = """
+(texts) => {
+    if (document.querySelector('[data-qa="success"]')) return '[data-qa="success"]';
+    for (const text of texts) {
+        const xpath = `//body//*[not(self::script or self::style)][normalize-space(text())="${text}"]`;
+        if (document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue) {
+            return text;
+        }
+    }
+    return location.href.toLowerCase().includes('apply') ? false : 'url';
+}
+"""
+
+# Instructions for free-text answers
+_TEXT_ANSWER_CONTEXT = "Based on the candidate's resume, provide a concise professional answer. Keep it brief (1-2 sentences for short answer, 3-4 for longer questions)."
+
+# Instructions for the pre-pass batch, which mixes free-text and option questions
+_BATCH_ANSWER_CONTEXT = (
+    _TEXT_ANSWER_CONTEXT
+    + " For a question that lists single-choice options, reply with ONLY the exact option text."
+    + " For a question that lists multi-choice options, reply with the exact texts of the options"
+    + " to select, separated by ' | ', or an empty string if none apply."
+)
+
+# Describe every form item in one round-trip: question, widget kind, option
+# labels (radio/checkbox) and whether it already holds a value. Items are the Lever posting fields, or
+# every 'form li' when there are none. Each item is tagged with data-pf-id so
+# the Python side can find it again (or write to it) without re-querying.
+_FORM_SCHEMA_JS = """
+() => {
+    let items = document.querySelectorAll('li[class*="posting-field"]');
+    if (!items.length) items = document.querySelectorAll('form li');
+    return Array.from(items, describe);
+    
+    function describe(li, i) {
+        const text = li.innerText || '';
+        li.setAttribute('data-pf-id', String(i));
+        const field = {
+            pf_id: String(i),
+            question: text.split('\\n')[0].trim(),
+            text_length: text.trim().length,
+            kind: null,
+            filled: false,
+            dropdown_text: '',
+            options: []
+        };
+        const dropdown = li.querySelector('[role="combobox"], select');
+        if (dropdown) {
+            field.kind = 'dropdown';
+            field.dropdown_text = dropdown.innerText || '';
+        } else if (li.querySelector('input[type="radio"]')) {
+            field.kind = 'radio';
+            field.options = optionLabels(li, 'input[type="radio"]');
+        } else if (li.querySelector('input[type="checkbox"]')) {
+            field.kind = 'checkbox';
+            field.options = optionLabels(li, 'input[type="checkbox"]');
+        } else {
+            const input = li.querySelector('input[type="text"]:not([type="hidden"]), textarea');
+            if (input) {
+                field.kind = 'text';
+                field.filled = (input.value || '').trim() !== '';
+            }
+        }
+        return field;
+    }
+    
+    function optionLabels(li, selector) {
+        return Array.from(li.querySelectorAll(selector), optionLabel).filter(Boolean);
+    }
+    
+""" + _OPTION_LABEL_JS + """
+}
+"""
+
+# Form schema and page checkboxes together, so the fill pass starts from one
+# round-trip: {fields: _FORM_SCHEMA_JS result, checkboxes: _CHECKBOX_LABELS_JS result}
+_FORM_SNAPSHOT_JS = f"() => ({{fields: ({_FORM_SCHEMA_JS.strip()})(), checkboxes: ({_CHECKBOX_LABELS_JS.strip()})()}})"
+
+# Write text answers ({pf_id: value}) into their items' empty inputs, firing
+# the events a typed value would. Returns {written: pf_ids, kept: pf_ids whose
+# input already had a value (e.g. the cover letter), which is left alone}
+_APPLY_TEXT_FILLS_JS = """
+(fills) => {
+    const kept = [];
+    const written = Object.entries(fills).filter(([id, value]) => {
+        const input = document.querySelector(
+            `[data-pf-id="${id}"] input[type="text"]:not([type="hidden"]), [data-pf-id="${id}"] textarea`
+        );
+        if (!input) return false;
+        if (input.value.trim()) {
+            kept.push(id);
+            return false;
+        }
+        const proto = input.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(input, value);
+        input.dispatchEvent(new Event('input', { bubbles: true }));
+        input.dispatchEvent(new Event('change', { bubbles: true }));
+        return true;
+    }).map(([id]) => id);
+    return {written, kept};
+}
+"""
+
+
+def _is_location_search(response) -> bool:
+    """Whether a response is the location autocomplete lookup."""
+    return "searchLocations" in response.url or "autocomplete" in response.url
+
 
 class FormHandler:
     """Handles all form filling operations."""
     
     def __init__(self, page: Page, llm_client: Optional[LLMClient], resume_helper: ResumeHelper, 
                  resume_data: Dict[str, Any], resume_file_path: Optional[str] = None, 
-                 job_description: str = ""):
-        """Initialize form handler."""
+                 job_description: str = "", resume_file: Optional[Dict[str, Any]] = None,
+                 submit_timing: Optional[SubmitTiming] = None):
+        """Initialize form handler.
+        
+        resume_file is an in-memory set_input_files payload (name, mimeType,
+        buffer) of the resume; when given it is uploaded instead of re-reading
+        resume_file_path from disk. submit_timing overrides the configured
+        SUBMIT_TIMING.
+        """
         self.page = page
         self.llm_client = llm_client
         self.resume_helper = resume_helper
         self.resume_data = resume_data
         self.resume_file_path = resume_file_path
+        self.resume_file = resume_file
+        self.submit_timing = submit_timing or SUBMIT_TIMING
         self.job_description = job_description
+        
+        # Scale for the remaining fixed delays (see _sleep)
+        self._sleep_mult = SLEEP_MULT
+        
+        # Question -> answer from the fill_application_form pre-pass, consumed
+        # by the radio/checkbox/text fillers before asking the LLM one by one
+        self._batch_answers: Dict[str, str] = {}
+    
+    async def _sleep(self, seconds: float):
+        """Sleep for a fixed delay scaled by SLEEP_MULT; 0 or less just yields."""
+        await asyncio.sleep(max(0.0, seconds * self._sleep_mult))
+    
+    async def _settle(self, element, expect: str, timeout: int = 500) -> bool:
+        """Wait until a JS predicate holds for an element, instead of a fixed sleep.
+        
+        Args:
+            element: Element handle the predicate receives
+            expect: JS predicate, e.g. "el => el.checked"
+            timeout: Milliseconds to wait before giving up
+        
+        Returns:
+            True if the predicate held within the timeout
+        """
+        try:
+            await self.page.wait_for_function(expect, arg=element, timeout=timeout)
+            return True
+        except Exception as e:
+            logger.debug(f"Element did not settle ({expect}): {e}")
+            return False
+    
+    async def _poll_until(self, check: Callable[[], Awaitable[Any]], initial: float = 0.1, factor: float = 2.0,
+                          max_interval: float = 1.0, timeout: float = 10.0) -> Any:
+        """Poll a check with exponential backoff until it returns something truthy.
+        
+        A check that raises (e.g. while the page is navigating) counts as not
+        done yet.
+        
+        Args:
+            check: Coroutine function to poll
+            initial: Seconds before the second check
+            factor: Growth of the interval after each check
+            max_interval: Longest interval between checks
+            timeout: Seconds to keep polling
+        
+        Returns:
+            The first truthy result, or None on timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = initial
+        while True:
+            try:
+                outcome = await check()
+                if outcome:
+                    return outcome
+            except Exception as e:
+                logger.debug(f"Poll check failed, retrying: {e}")
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * factor, max_interval)
     
     async def fill_basic_info(self, result: Dict[str, Any]):
         """Fill the basic info section - DIRECT from resume, no LLM needed."""
@@ -36,10 +583,11 @@ class FormHandler:
             ("Current company", experience[0].get("company", "") if experience else ""),
         ]
         
+        # One at a time: fill() focuses the input and inserts the text through
+        # the keyboard, so overlapping fills would race for focus
         for label_text, value in basic_fields:
-            if not value:
-                continue
-            await self._fill_field_by_label(label_text, value, result)
+            if value:
+                await self._fill_field_by_label(label_text, value, result)
         
         # Handle location separately (autocomplete)
         location = personal.get("location", "")
@@ -49,23 +597,15 @@ class FormHandler:
     async def _fill_field_by_label(self, label_text: str, value: str, result: Dict[str, Any]):
         """Fill a field by finding it through its label text."""
         try:
-            # Find the listitem containing this label
-            listitem = await self.page.query_selector(f'li:has-text("{label_text}")')
-            if not listitem:
+            # Find the input/textarea inside the listitem containing this label
+            input_field = self.page.locator('li', has_text=label_text).locator('input, textarea').first
+            if not await input_field.count():
                 logger.warning(f"Field not found: {label_text}")
                 return
             
-            # Find the input/textarea inside
-            input_field = await listitem.query_selector('input, textarea')
-            if not input_field:
-                logger.warning(f"Input not found in: {label_text}")
-                return
-            
             # Fill it
             await input_field.click()
-            await asyncio.sleep(0.1)
             await input_field.fill(value)
-            await asyncio.sleep(0.2)
             
             result["fields_filled"].append(label_text.lower().replace(" ", "_"))
             logger.info(f"Filled {label_text}: {value[:30]}...")
@@ -78,45 +618,49 @@ class FormHandler:
         try:
             logger.info(f"Filling location: {location}")
             
-            # Find location field by label
-            listitem = await self.page.query_selector('li:has-text("Current location")')
-            if not listitem:
+            # Find location field by label; the first input is the visible one
+            element = self.page.locator('li', has_text="Current location").locator('input').first
+            if not await element.count():
                 logger.warning("Location field not found")
                 return
             
-            # Get the visible input (first one)
-            inputs = await listitem.query_selector_all('input')
-            if not inputs:
-                logger.warning("Location input not found")
-                return
-            
-            element = inputs[0]  # First input is the visible one
-            
             # Click and clear
             await element.click()
-            await asyncio.sleep(0.3)
             await element.press("Control+a")
             await element.press("Backspace")
-            await asyncio.sleep(0.2)
             
-            # Type to trigger autocomplete
+            # Fill all but the last character at once, then type the last one
+            # so the autocomplete's key handlers fire, and wait for its lookup
+            # request instead of typing slowly and sleeping
             logger.info("Typing location...")
-            await element.type(location, delay=80)
+            await element.fill(location[:-1])
+            try:
+                async with self.page.expect_response(_is_location_search, timeout=3000) as response_info:
+                    await element.type(location[-1:])
+                suggestions = await (await response_info.value).json()
+                if not suggestions:
+                    logger.warning(f"No location suggestions for: {location}")
+            except Exception as e:
+                logger.debug(f"Location lookup response not seen: {e}")
             
-            # Wait for suggestions
+            # Wait for the suggestions to render
             logger.info("Waiting for dropdown...")
-            await asyncio.sleep(2)
+            try:
+                await self.page.wait_for_selector(_SUGGESTION_SELECTOR, timeout=2000)
+            except Exception:
+                logger.debug("No location suggestions appeared")
             
             # Select first option with keyboard
             logger.info("Selecting first suggestion...")
             await element.press("ArrowDown")
-            await asyncio.sleep(0.3)
             await element.press("Enter")
-            await asyncio.sleep(0.5)
             
-            # Click elsewhere to close dropdown
-            await self.page.click("body")
-            await asyncio.sleep(0.3)
+            # Close the dropdown if still open and wait until it is gone
+            await self.page.keyboard.press("Escape")
+            try:
+                await self.page.locator(_SUGGESTION_LIST_SELECTOR).first.wait_for(state="hidden", timeout=1000)
+            except Exception:
+                pass
             
             result["fields_filled"].append("location")
             logger.info("Location filled successfully")
@@ -126,38 +670,51 @@ class FormHandler:
             result["errors"].append(f"Location: {str(e)}")
     
     async def fill_application_form(self, result: Dict[str, Any]):
-        """Fill application form - uses LLM for complex questions."""
+        """Fill application form - uses LLM for complex questions.
+        
+        The form is read with one evaluate (see _FORM_SNAPSHOT_JS) and all plain
+        text answers are written with one more (see _APPLY_TEXT_FILLS_JS);
+        dropdowns, radios and checkboxes still go through their element
+        handlers since they need clicks and option lookups.
+        
+        Text, radio and checkbox questions the resume can't answer are sent to
+        the LLM together in one batch (see batch_answer) before anything is
+        filled, so the per-field fillers only look up their answer.
+        """
         
-        # Get all form questions (listitems in the application form section)
-        form_items = await self.page.query_selector_all('li[class*="posting-field"]')
-        if not form_items:
-            # Try alternative selector
-            form_items = await self.page.query_selector_all('form li')
+        # Describe all form questions (listitems in the application form section)
+        # (plus every checkbox label, for the consent pass) in one round-trip
+        snapshot = await self.page.evaluate(_FORM_SNAPSHOT_JS)
+        schema = snapshot["fields"]
         
-        logger.info(f"Found {len(form_items)} form items")
+        logger.info(f"Found {len(schema)} form items")
         
         # First, handle all consent checkboxes
-        await self.fill_all_consent_checkboxes(result)
+        await self.fill_all_consent_checkboxes(result, snapshot["checkboxes"])
         
-        # Handle cover letter specifically
-        await self.fill_cover_letter(result)
+        # Handle cover letter specifically; its LLM call is independent of the
+        # question batch below, so the two run concurrently
+        cover_letter_task = asyncio.create_task(self.fill_cover_letter(result))
         
         # Track which items we've already processed (to avoid processing child items)
         processed_questions = set()
+        # pf_id -> answer for text fields, written in one evaluate at the end
+        text_fills: Dict[str, str] = {}
+        text_questions: Dict[str, str] = {}
+        # Radio/checkbox/dropdown items to fill once the batch is answered
+        widgets: List[Tuple[Dict[str, Any], str, bool]] = []
+        # Questions left for the LLM batch
+        unresolved: List[Dict[str, Any]] = []
+        # Diversity dropdowns that failed, retried once after the main pass
+        unfilled_diversity: List[Tuple[Any, str]] = []
         
-        for item in form_items:
+        for field in schema:
             try:
-                # Get the question text
-                item_text = await item.inner_text()
-                if not item_text or len(item_text.strip()) < 3:
+                question = field["question"]
+                if field["text_length"] < 3:
                     continue
                 
-                # Get first line as question (ignore option texts)
-                lines = item_text.split('\n')
-                question = lines[0].strip()
-                
-                # Check if this item has a dropdown/select field (even if question is short)
-                has_dropdown = await item.query_selector('[role="combobox"], select')
+                has_dropdown = field["kind"] == "dropdown"
                 
                 # Skip if this looks like just an option (short text without ?)
                 # BUT don't skip if it has a dropdown (like "Ethnicity", "Gender", etc.)
@@ -166,12 +723,13 @@ class FormHandler:
                         continue  # Skip only if it doesn't have a dropdown
                 
                 # Skip already processed or basic fields
-                basic_labels = ["full name", "email", "phone", "current location", "current company", "resume", "linkedin", "cv"]
-                if any(label in question.lower() for label in basic_labels):
+                q_lower = question.lower()
+                tags = _question_tags(q_lower)
+                if "basic" in tags:
                     continue
                 
                 # Skip if we already processed a similar question
-                question_key = question.lower()[:30]
+                question_key = q_lower[:30]
                 if question_key in processed_questions:
                     continue
                 processed_questions.add(question_key)
@@ -179,130 +737,196 @@ class FormHandler:
                 logger.info(f"Processing: {question[:50]}...")
                 
                 # Log diversity fields explicitly for debugging
-                if any(word in question.lower() for word in ["ethnicity", "race", "ethnic", "gender", "diverse"]):
+                is_diversity = "diversity" in tags
+                if is_diversity:
                     logger.info(f"🔍 DIVERSITY FIELD DETECTED: {question[:50]}")
                 
-                # Determine field type and fill accordingly
-                dropdown = await item.query_selector('[role="combobox"], select')
-                radio_buttons = await item.query_selector_all('input[type="radio"]')
-                checkbox_buttons = await item.query_selector_all('input[type="checkbox"]')
-                text_input = await item.query_selector('input[type="text"]:not([type="hidden"]), textarea')
+                kind = field["kind"]
+                if kind == "text":
+                    if field["filled"]:
+                        logger.info(f"Text field already filled: {question[:30]}...")
+                        continue
+                    if "cover letter" in q_lower:
+                        continue  # Written by fill_cover_letter
+                    # Resume answers now; the rest go to the LLM in one batch below
+                    text_questions[field["pf_id"]] = question
+                    answer = self.resume_helper.get_answer(question)
+                    if answer:
+                        text_fills[field["pf_id"]] = answer
+                    else:
+                        unresolved.append({"id": field["pf_id"], "question": question, "type": "text"})
+                    continue
+                if kind is None:
+                    logger.warning(f"Could not fill: {question[:40]}...")
+                    continue
+                
+                options = field["options"]
+                if kind == "radio" and options and not self._choose_radio_option(question, options):
+                    unresolved.append({"id": field["pf_id"], "question": question, "type": "radio", "options": options})
+                elif kind == "checkbox":
+                    # Consent/terms/privacy boxes are decided by preferences
+                    open_options = [
+                        opt for opt in options
+                        if not self._checkbox_category(opt.lower(), _CHECKBOX_CATEGORIES)
+                    ]
+                    if open_options:
+                        unresolved.append({"id": field["pf_id"], "question": question, "type": "checkbox", "options": open_options})
+                widgets.append((field, question, is_diversity))
+                    
+            except Exception as e:
+                logger.warning(f"Error processing form item: {e}")
+        
+        # Answer every unresolved question with one LLM call
+        batch = await self.batch_answer(unresolved)
+        # Widgets are filled with clicks and key presses; let the cover letter
+        # finish writing its textarea first
+        await cover_letter_task
+        for entry in unresolved:
+            answer = batch.get(entry["id"])
+            if answer is None:
+                continue
+            self._batch_answers[entry["question"]] = answer
+            if entry["type"] == "text":
+                text_fills[entry["id"]] = answer
+        
+        for field, question, is_diversity in widgets:
+            try:
+                # Interactive widgets need the element handle
+                item = await self.page.query_selector(f'[data-pf-id="{field["pf_id"]}"]')
+                if not item:
+                    continue
                 
                 filled = False
+                kind = field["kind"]
                 
                 # Priority: Handle dropdowns first, especially diversity fields
-                if dropdown:
+                if kind == "dropdown":
                     # For diversity fields, ensure we fill them
-                    if any(word in question.lower() for word in ["ethnicity", "race", "ethnic", "gender", "age bracket", "veteran", "disability"]):
+                    if is_diversity:
                         logger.info(f"🔍 Filling diversity dropdown: {question[:50]}")
-                    filled = await self.fill_dropdown_smart(item, question, result)
-                elif len(radio_buttons) > 0:
+                    filled = await self.fill_dropdown_smart(item, question, result, field["dropdown_text"])
+                    if not filled and is_diversity:
+                        unfilled_diversity.append((item, question))
+                elif kind == "radio":
+                    radio_buttons = await item.query_selector_all('input[type="radio"]')
                     filled = await self.fill_radio_smart(item, radio_buttons, question, result)
-                elif len(checkbox_buttons) > 0:
+                elif kind == "checkbox":
+                    checkbox_buttons = await item.query_selector_all('input[type="checkbox"]')
                     filled = await self.fill_checkbox_smart(item, checkbox_buttons, question, result)
-                elif text_input:
-                    filled = await self.fill_text_smart(item, text_input, question, result)
                 
                 if not filled:
                     logger.warning(f"Could not fill: {question[:40]}...")
                     
             except Exception as e:
                 logger.warning(f"Error processing form item: {e}")
+        
+        for item, question in unfilled_diversity:
+            logger.info(f"🔍 Retrying diversity field: {question[:30]}")
+            try:
+                if await self.fill_dropdown_smart(item, question, result, current_text=""):
+                    logger.info(f"✓ Successfully filled diversity field: {question[:30]}")
+                else:
+                    logger.warning(f"Failed to fill diversity field: {question[:30]}")
+            except Exception as e:
+                logger.debug(f"Error retrying diversity field: {e}")
+        
+        for pf_id in text_questions.keys() - text_fills.keys():
+            logger.warning(f"Could not fill: {text_questions[pf_id][:40]}...")
+        
+        if text_fills:
+            try:
+                outcome = await self.page.evaluate(_APPLY_TEXT_FILLS_JS, text_fills)
+                written, kept = outcome["written"], outcome["kept"]
+            except Exception as e:
+                logger.warning(f"Error writing text fields: {e}")
+                written, kept = [], []
+            for pf_id in written:
+                question = text_questions[pf_id]
+                result["fields_filled"].append(f"text_{question[:20]}")
+                logger.info(f"✓ Filled '{question[:30]}': {text_fills[pf_id][:30]}...")
+            for pf_id in kept:
+                logger.info(f"Text field already filled: {text_questions[pf_id][:30]}...")
+            for pf_id in text_fills.keys() - set(written) - set(kept):
+                logger.warning(f"Could not fill: {text_questions[pf_id][:40]}...")
     
-    async def fill_diversity_fields(self, result: Dict[str, Any]):
-        """Explicitly find and fill diversity fields (ethnicity, gender, etc.)."""
-        try:
-            logger.info("Checking diversity fields...")
-            
-            # Find all form items that might contain diversity fields
-            form_items = await self.page.query_selector_all('form li')
-            
-            for item in form_items:
-                try:
-                    item_text = await item.inner_text()
-                    if not item_text:
-                        continue
-                    
-                    question = item_text.split('\n')[0].strip()
-                    
-                    # Check if this is a diversity field
-                    is_diversity = any(word in question.lower() for word in 
-                                     ["ethnicity", "race", "ethnic", "gender", "age bracket", "veteran", "disability"])
-                    
-                    if is_diversity:
-                        # Check if it has a dropdown
-                        dropdown = await item.query_selector('[role="combobox"], select')
-                        if dropdown:
-                            # Check if already filled
-                            current_text = await dropdown.inner_text()
-                            if current_text and "Select" not in current_text and len(current_text.strip()) > 3:
-                                logger.info(f"Diversity field already filled: {question[:30]} = {current_text[:20]}")
-                                continue
-                            
-                            # Fill it
-                            logger.info(f"🔍 Filling diversity field: {question[:30]}")
-                            filled = await self.fill_dropdown_smart(item, question, result)
-                            if filled:
-                                logger.info(f"✓ Successfully filled diversity field: {question[:30]}")
-                            else:
-                                logger.warning(f"Failed to fill diversity field: {question[:30]}")
-                except Exception as e:
-                    logger.debug(f"Error checking diversity field: {e}")
-                    continue
-                    
-        except Exception as e:
-            logger.warning(f"Diversity fields check error: {e}")
+    async def batch_answer(self, unresolved: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Answer several form questions with a single LLM call.
+        
+        Args:
+            unresolved: One dict per question with ``id``, ``question``,
+                ``type`` (text/radio/checkbox) and, for radio/checkbox,
+                ``options`` (the label texts to choose from)
+        
+        Returns:
+            Question ID -> answer for the questions the LLM answered
+        """
+        if not unresolved or not self.llm_client:
+            return {}
+        
+        questions = {}
+        for entry in unresolved:
+            question = entry["question"]
+            if entry["type"] == "radio":
+                question += f"\nSingle-choice options: {' | '.join(entry['options'])}"
+            elif entry["type"] == "checkbox":
+                question += f"\nMulti-choice options: {' | '.join(entry['options'])}"
+            questions[entry["id"]] = question
+        
+        logger.info(f"Asking the LLM {len(questions)} form questions in one batch")
+        return await self.llm_client.ask_batch(questions, self.resume_data, self.job_description, _BATCH_ANSWER_CONTEXT)
+    
+    def _auto_check_kinds(self) -> Tuple[str, ...]:
+        """Checkbox categories the consent preferences allow checking automatically."""
+        consent_prefs = self.resume_helper.get_consent_preferences()
+        return tuple(kind for kind in _CHECKBOX_CATEGORIES if consent_prefs.get(f"auto_check_{kind}", True))
+    
+    @staticmethod
+    def _checkbox_category(label_lower: str, kinds: Tuple[str, ...]) -> Optional[str]:
+        """First of kinds whose keywords occur in a lowercased checkbox label, if any."""
+        hits = _CHECKBOX_CATEGORY_RE.match(label_lower)
+        return next((kind for kind in kinds if hits.group(kind)), None)
     
-    async def fill_all_consent_checkboxes(self, result: Dict[str, Any]):
-        """Find and check all consent checkboxes based on preferences."""
+    async def fill_all_consent_checkboxes(self, result: Dict[str, Any],
+                                          checkboxes: Optional[List[Dict[str, Any]]] = None):
+        """Find and check all consent checkboxes based on preferences.
+        
+        Args:
+            result: Result dict to update
+            checkboxes: _CHECKBOX_LABELS_JS result already read by the caller;
+                read from the page when None
+        """
         try:
             logger.info("Looking for consent checkboxes...")
             
             # Get consent preferences from resume.json
-            consent_prefs = self.resume_helper.get_consent_preferences()
-            auto_check_consent = consent_prefs.get("auto_check_consent", True)
-            auto_check_terms = consent_prefs.get("auto_check_terms", True)
-            auto_check_privacy = consent_prefs.get("auto_check_privacy", True)
+            auto_check_kinds = self._auto_check_kinds()
             
-            if not (auto_check_consent or auto_check_terms or auto_check_privacy):
+            if not auto_check_kinds:
                 logger.info("Consent auto-check disabled in preferences")
                 return
             
-            # Find all checkboxes that look like consent
-            checkboxes = await self.page.query_selector_all('input[type="checkbox"]')
+            # Read every checkbox and its label in one round-trip
+            if checkboxes is None:
+                checkboxes = await self.page.evaluate(_CHECKBOX_LABELS_JS)
             
+            to_check = {}
             for checkbox in checkboxes:
-                try:
-                    is_checked = await checkbox.is_checked()
-                    if not is_checked:
-                        # Check the parent for consent-related text
-                        parent = await checkbox.evaluate_handle("el => el.closest('label') || el.closest('li') || el.parentElement")
-                        if parent:
-                            text = await parent.evaluate("el => el.innerText || ''")
-                            text_lower = text.lower()
-                            
-                            # Check consent boxes
-                            if auto_check_consent and any(word in text_lower for word in ["consent", "agree", "accept", "acknowledge", "confirm"]):
-                                await checkbox.click()
-                                await asyncio.sleep(0.2)
-                                logger.info(f"Checked consent: {text[:40]}... (from preferences)")
-                                result["fields_filled"].append("consent_checkbox")
-                            
-                            # Check terms boxes
-                            elif auto_check_terms and "terms" in text_lower:
-                                await checkbox.click()
-                                await asyncio.sleep(0.2)
-                                logger.info(f"Checked terms: {text[:40]}... (from preferences)")
-                                result["fields_filled"].append("terms_checkbox")
-                            
-                            # Check privacy boxes
-                            elif auto_check_privacy and "privacy" in text_lower:
-                                await checkbox.click()
-                                await asyncio.sleep(0.2)
-                                logger.info(f"Checked privacy: {text[:40]}... (from preferences)")
-                                result["fields_filled"].append("privacy_checkbox")
-                except:
+                if checkbox["checked"]:
                     continue
+                # Check consent, then terms, then privacy boxes
+                kind = self._checkbox_category(checkbox["text"].lower(), auto_check_kinds)
+                if kind:
+                    to_check[checkbox["i"]] = (kind, checkbox["text"])
+            
+            if not to_check:
+                return
+            
+            # Click all chosen boxes in the page with one round-trip
+            checked = await self.page.evaluate(_CHECK_CHECKBOXES_JS, list(to_check))
+            for index in checked:
+                kind, text = to_check[index]
+                logger.info(f"Checked {kind}: {text[:40]}... (from preferences)")
+                result["fields_filled"].append(f"{kind}_checkbox")
                     
         except Exception as e:
             logger.warning(f"Consent checkbox error: {e}")
@@ -312,30 +936,21 @@ class FormHandler:
         try:
             logger.info("Looking for cover letter field...")
             
-            # Find cover letter field by looking for textarea in relevant sections
+            # Find cover letter field by looking for textarea in relevant sections,
+            # resolving only the first match of each candidate
+            candidates = [
+                # Method 1: Find by label text
+                self.page.locator('li', has_text="cover letter").locator('textarea'),
+                # Method 2: Find textarea with cover letter placeholder
+                self.page.locator(_COVER_LETTER_TEXTAREA_SELECTOR),
+                # Method 3: Find in "Additional Information" section
+                self.page.locator('li', has_text="Additional").locator('textarea'),
+            ]
             textarea = None
-            
-            # Method 1: Find by label text
-            cover_letter_item = await self.page.query_selector('li:has-text("cover letter")')
-            if cover_letter_item:
-                textarea = await cover_letter_item.query_selector('textarea')
-            
-            # Method 2: Find textarea with cover letter placeholder
-            if not textarea:
-                textareas = await self.page.query_selector_all('textarea')
-                for ta in textareas:
-                    placeholder = await ta.get_attribute("placeholder") or ""
-                    aria_label = await ta.get_attribute("aria-label") or ""
-                    combined = (placeholder + aria_label).lower()
-                    if "cover" in combined or "letter" in combined or "why" in combined:
-                        textarea = ta
-                        break
-            
-            # Method 3: Find in "Additional Information" section
-            if not textarea:
-                additional_section = await self.page.query_selector('li:has-text("Additional")')
-                if additional_section:
-                    textarea = await additional_section.query_selector('textarea')
+            for candidate in candidates:
+                if await candidate.count():
+                    textarea = candidate.first
+                    break
             
             if not textarea:
                 logger.info("No cover letter field found")
@@ -349,7 +964,7 @@ class FormHandler:
             
             # Generate cover letter with LLM
             if self.llm_client:
-                cover_letter = self.llm_client.ask(
+                cover_letter = await self.llm_client.ask(
                     "Write a professional cover letter for this job application",
                     self.resume_data,
                     self.job_description,
@@ -362,10 +977,7 @@ class FormHandler:
                 )
                 
                 if cover_letter:
-                    await textarea.click()
-                    await asyncio.sleep(0.1)
                     await textarea.fill(cover_letter)
-                    await asyncio.sleep(0.2)
                     result["fields_filled"].append("cover_letter")
                     logger.info(f"Filled cover letter ({len(cover_letter)} chars)")
             else:
@@ -381,30 +993,127 @@ Thank you for considering my application. I look forward to the opportunity to d
 Best regards,
 {self.resume_data.get('personal_info', {}).get('full_name', 'Candidate')}"""
                 
-                await textarea.click()
-                await asyncio.sleep(0.1)
                 await textarea.fill(default_letter)
-                await asyncio.sleep(0.2)
                 result["fields_filled"].append("cover_letter")
                 logger.info("Filled default cover letter")
                 
         except Exception as e:
             logger.warning(f"Cover letter error: {e}")
     
-    async def fill_dropdown_smart(self, item, question: str, result: Dict[str, Any]) -> bool:
-        """Fill dropdown with smart option selection. Returns True if filled."""
+    async def _wait_for_dropdown(self, dropdown, expanded: bool, timeout: int = 1000):
+        """Wait for a dropdown to open or close instead of sleeping a fixed time.
+        
+        Args:
+            dropdown: Dropdown element handle
+            expanded: Wait for it to be open (True) or closed (False)
+            timeout: Maximum wait in milliseconds; timing out is not an error
+        """
+        try:
+            await self.page.wait_for_function(
+                _DROPDOWN_OPEN_JS if expanded else _DROPDOWN_CLOSED_JS, arg=dropdown, timeout=timeout
+            )
+        except Exception:
+            pass  # Native selects never set aria-expanded; carry on
+    
+    async def _choose_dropdown_option(self, question: str, option_texts: List[str]) -> Optional[str]:
+        """Pick the option to select for a dropdown question.
+        
+        Args:
+            question: Question text
+            option_texts: Visible option texts, in order
+        
+        Returns:
+            Chosen option text, or None if there are no options
+        """
+        q_lower = question.lower()
+        best_match = None
+        
+        # 1. Diversity fields
+        if _DIVERSITY_RE.search(q_lower):
+            for opt in option_texts:
+                if _DECLINE_RE.search(opt.lower()):
+                    best_match = opt
+                    break
+        
+        # 2. Recurring questions answered by the resume
+        if not best_match:
+            best_match = self.resume_helper.answer_from_resume(question, option_texts)
+        
+        # 3. Use resume helper for defaults
+        if not best_match:
+            best_match = self.resume_helper.get_default_dropdown_value(question, option_texts)
+        
+        # 4. Use LLM for unknown fields
+        if not best_match and self.llm_client:
+            llm_answer = await self.llm_client.ask(
+                f"Question: {question}",
+                self.resume_data,
+                self.job_description,
+                f"Available options: {', '.join(option_texts[:15])}\n\nBased on the candidate's resume, which option should be selected? Reply with ONLY the exact option text, nothing else."
+            )
+            for opt in option_texts:
+                if opt.lower() == llm_answer.lower() or opt.lower() in llm_answer.lower() or llm_answer.lower() in opt.lower():
+                    best_match = opt
+                    break
+        
+        # 5. Default: first option
+        if not best_match and option_texts:
+            best_match = option_texts[0]
+        
+        return best_match
+    
+    async def _fill_native_select(self, select, question: str, result: Dict[str, Any]) -> bool:
+        """Fill a native <select> with select_option, without opening it.
+        
+        Args:
+            select: The <select> element handle
+            question: Question text
+            result: Result dict to update
+        
+        Returns:
+            True if an option is (or already was) selected
+        """
+        state = await select.evaluate(_NATIVE_SELECT_JS)
+        if state["selected"]:
+            logger.info(f"Dropdown already filled: {question[:30]}... = {state['selected'][:20]}")
+            return True
+        
+        best_match = await self._choose_dropdown_option(question, state["options"])
+        if not best_match:
+            return False
+        
+        await select.select_option(label=best_match)
+        result["fields_filled"].append(f"dropdown_{question[:20]}")
+        logger.info(f"✓ Selected '{best_match}' for '{question[:30]}' (native select)")
+        return True
+    
+    async def fill_dropdown_smart(self, item, question: str, result: Dict[str, Any],
+                                  current_text: Optional[str] = None) -> bool:
+        """Fill dropdown with smart option selection. Returns True if filled.
+        
+        Args:
+            item: Form item containing the dropdown
+            question: Question text
+            result: Result dict to update
+            current_text: Dropdown text already read by the caller ("" when
+                known to be empty); read from the page when None
+        """
         try:
             dropdown = await item.query_selector('[role="combobox"]')
             if not dropdown:
-                dropdown = await item.query_selector('select')
-            if not dropdown:
+                # Native selects are set directly; only custom widgets need
+                # to be opened and navigated
+                select = await item.query_selector('select')
+                if select:
+                    return await self._fill_native_select(select, question, result)
                 return False
             
             # Check if already selected
-            current_text = await dropdown.inner_text()
+            if current_text is None:
+                current_text = await dropdown.inner_text()
             if current_text:
                 lines = current_text.strip().split('\n')
-                if len(lines) > 1 or any(word in current_text.lower() for word in ["male", "female", "select", "choose"]):
+                if len(lines) > 1 or _PLACEHOLDER_RE.search(current_text.lower()):
                     pass
                 elif current_text.strip() and "Select" not in current_text:
                     logger.info(f"Dropdown already filled: {question[:30]}... = {current_text[:20]}")
@@ -412,11 +1121,9 @@ Best regards,
             
             # Click to open dropdown and ensure focus
             await dropdown.scroll_into_view_if_needed()
-            await asyncio.sleep(0.1)
             await dropdown.click()
-            await asyncio.sleep(0.4)
+            await self._wait_for_dropdown(dropdown, expanded=True)
             await dropdown.focus()
-            await asyncio.sleep(0.1)
             
             # Get available options
             option_selectors = [
@@ -427,100 +1134,57 @@ Best regards,
                 'ul[class*="dropdown"] li',
             ]
             
+            # Read all option texts in one round-trip per selector; the
+            # element for the chosen option is resolved by index later
             options = []
+            option_locator = None
             for sel in option_selectors:
-                options = await self.page.query_selector_all(sel)
+                options = await self.page.eval_on_selector_all(sel, _OPTION_TEXTS_JS)
+                option_locator = self.page.locator(sel)
                 if len(options) > 1:
                     break
             
-            option_texts = []
-            option_elements = []
-            
-            for opt in options:
-                try:
-                    text = await opt.inner_text()
-                    text = text.strip()
-                    if text and text != "Select..." and text != "Select" and len(text) > 0:
-                        option_texts.append(text)
-                        option_elements.append(opt)
-                except:
-                    continue
-            
             # If still no options, try getting them from the dropdown itself
-            if not option_texts:
+            if not options:
                 try:
-                    dropdown_options = await dropdown.query_selector_all('option, [role="option"], div')
-                    for opt in dropdown_options:
-                        text = await opt.inner_text()
-                        text = text.strip()
-                        if text and text != "Select..." and text != "Select":
-                            option_texts.append(text)
-                            option_elements.append(opt)
+                    options = await dropdown.eval_on_selector_all(_INLINE_OPTION_SELECTOR, _OPTION_TEXTS_JS)
+                    option_locator = None
                 except:
                     pass
             
+            option_texts = [text for _, text in options]
+            option_indices = [index for index, _ in options]
+            
             logger.info(f"Found {len(option_texts)} options for '{question[:30]}'")
             
             if not option_texts:
                 # Last resort: try keyboard navigation
                 logger.info("No visible options found, trying keyboard navigation...")
                 q_lower = question.lower()
-                if any(word in q_lower for word in ["gender", "ethnicity", "race", "ethnic", "age bracket", "veteran", "disability"]):
+                if _DIVERSITY_RE.search(q_lower):
                     for i in range(10):
                         await self.page.keyboard.press("ArrowDown")
-                        await asyncio.sleep(0.1)
                         current_text = await dropdown.inner_text()
-                        if current_text and any(phrase in current_text.lower() for phrase in ["prefer not", "decline", "not to say"]):
+                        if current_text and _DECLINE_RE.search(current_text.lower()):
                             await self.page.keyboard.press("Enter")
-                            await asyncio.sleep(0.2)
+                            await self._wait_for_dropdown(dropdown, expanded=False)
                             result["fields_filled"].append(f"dropdown_{question[:20]}")
                             logger.info(f"✓ Selected 'Prefer not to say' via keyboard")
                             return True
                     await self.page.keyboard.press("Enter")
-                    await asyncio.sleep(0.2)
+                    await self._wait_for_dropdown(dropdown, expanded=False)
                     result["fields_filled"].append(f"dropdown_{question[:20]}")
                     logger.info(f"✓ Selected option via keyboard (diversity field)")
                     return True
                 
                 await self.page.keyboard.press("ArrowDown")
-                await asyncio.sleep(0.2)
                 await self.page.keyboard.press("Enter")
-                await asyncio.sleep(0.2)
+                await self._wait_for_dropdown(dropdown, expanded=False)
                 result["fields_filled"].append(f"dropdown_{question[:20]}")
                 logger.info(f"✓ Selected first option via keyboard")
                 return True
             
-            # Determine best option
-            q_lower = question.lower()
-            best_match = None
-            
-            # 1. Diversity fields
-            if any(word in q_lower for word in ["gender", "ethnicity", "race", "age bracket", "veteran", "disability", "diversity"]):
-                for opt in option_texts:
-                    if "prefer not" in opt.lower() or "decline" in opt.lower():
-                        best_match = opt
-                        break
-            
-            # 2. Use resume helper for defaults
-            if not best_match:
-                best_match = self.resume_helper.get_default_dropdown_value(question, option_texts)
-            
-            # 3. Use LLM for unknown fields
-            if not best_match and self.llm_client:
-                llm_answer = self.llm_client.ask(
-                    f"Question: {question}",
-                    self.resume_data,
-                    self.job_description,
-                    f"Available options: {', '.join(option_texts[:15])}\n\nBased on the candidate's resume, which option should be selected? Reply with ONLY the exact option text, nothing else."
-                )
-                for opt in option_texts:
-                    if opt.lower() == llm_answer.lower() or opt.lower() in llm_answer.lower() or llm_answer.lower() in opt.lower():
-                        best_match = opt
-                        break
-            
-            # 4. Default: first option
-            if not best_match and option_texts:
-                best_match = option_texts[0]
+            best_match = await self._choose_dropdown_option(question, option_texts)
             
             # Select the option - KEYBOARD FIRST
             if best_match:
@@ -532,10 +1196,9 @@ Best regards,
                         try:
                             for _ in range(i + 1):
                                 await self.page.keyboard.press("ArrowDown")
-                                await asyncio.sleep(0.05)
                             
                             await self.page.keyboard.press("Enter")
-                            await asyncio.sleep(0.5)
+                            await self._wait_for_dropdown(dropdown, expanded=False)
                             
                             try:
                                 is_open = await dropdown.evaluate("el => el.getAttribute('aria-expanded') === 'true'")
@@ -567,8 +1230,12 @@ Best regards,
                 for i, opt_text in enumerate(option_texts):
                     if opt_text == best_match:
                         try:
-                            await option_elements[i].click()
-                            await asyncio.sleep(0.3)
+                            if option_locator is not None:
+                                option_element = option_locator.nth(option_indices[i])
+                            else:
+                                option_element = (await dropdown.query_selector_all(_INLINE_OPTION_SELECTOR))[option_indices[i]]
+                            await option_element.click()
+                            await self._wait_for_dropdown(dropdown, expanded=False)
                             result["fields_filled"].append(f"dropdown_{question[:20]}")
                             logger.info(f"✓ Selected '{best_match}' via click")
                             return True
@@ -578,7 +1245,7 @@ Best regards,
             
             # Close dropdown
             await self.page.keyboard.press("Escape")
-            await asyncio.sleep(0.2)
+            await self._wait_for_dropdown(dropdown, expanded=False)
             return False
             
         except Exception as e:
@@ -589,58 +1256,58 @@ Best regards,
                 pass
             return False
     
+    def _choose_radio_option(self, question: str, option_texts: List[str]) -> Optional[str]:
+        """Pick a radio option from the resume or yes/no defaults, without the LLM."""
+        best_match = self.resume_helper.answer_from_resume(question, option_texts)
+        
+        # Yes/No questions - smart defaults
+        if not best_match and frozenset(map(str.lower, option_texts)) == _YES_NO:
+            q_lower = question.lower()
+            if _YES_QUESTION_RE.search(q_lower):
+                best_match = next((opt for opt in option_texts if opt.lower() == "yes"), None)
+            elif _NO_QUESTION_RE.search(q_lower):
+                best_match = next((opt for opt in option_texts if opt.lower() == "no"), None)
+        return best_match
+    
     async def fill_radio_smart(self, item, radio_buttons, question: str, result: Dict[str, Any]) -> bool:
         """Fill radio buttons with smart selection. Returns True if filled."""
         try:
+            # Read every radio's checked state and label text in one round-trip
+            radios = await item.eval_on_selector_all('input[type="radio"]', _RADIO_OPTIONS_JS)
+            
             # Check if any is already selected
-            for radio in radio_buttons:
-                if await radio.is_checked():
-                    logger.info(f"Radio already selected for: {question[:30]}...")
-                    return True
+            if any(radio["checked"] for radio in radios):
+                logger.info(f"Radio already selected for: {question[:30]}...")
+                return True
             
-            # Get option labels
-            option_texts = []
-            option_labels = []
-            for radio in radio_buttons:
-                try:
-                    label = await radio.evaluate_handle("el => el.closest('label') || el.parentElement.querySelector('label')")
-                    if label:
-                        text = await label.evaluate("el => el.innerText || ''")
-                        text = text.strip()
-                        if text:
-                            option_texts.append(text)
-                            option_labels.append(label)
-                except:
-                    continue
+            # Get option labels (radios without a label can't be chosen)
+            option_texts = [radio["text"] for radio in radios if radio["text"]]
+            option_indices = [i for i, radio in enumerate(radios) if radio["text"]]
             
             if not option_texts:
                 return False
             
             logger.info(f"Radio options for '{question[:30]}': {option_texts[:5]}")
             
-            # Determine best option
-            q_lower = question.lower()
-            best_match = None
-            
-            # Yes/No questions - smart defaults
-            if set(opt.lower() for opt in option_texts) == {"yes", "no"}:
-                if any(word in q_lower for word in ["open to", "willing", "available", "interested", "able to", "authorized"]):
-                    best_match = next((opt for opt in option_texts if opt.lower() == "yes"), None)
-                elif any(word in q_lower for word in ["require", "need", "visa"]):
-                    best_match = next((opt for opt in option_texts if opt.lower() == "no"), None)
-            
-            # Use LLM if no match
-            if not best_match and self.llm_client:
-                llm_answer = self.llm_client.ask(
+            # Determine best option, from the resume and yes/no defaults first
+            best_match = self._choose_radio_option(question, option_texts)
+            
+            # Use the batched LLM answer, or ask if the pre-pass didn't cover it
+            llm_answer = self._batch_answers.get(question)
+            if not best_match and llm_answer is None and self.llm_client:
+                llm_answer = await self.llm_client.ask(
                     f"Question: {question}",
                     self.resume_data,
                     self.job_description,
                     f"Available options: {', '.join(option_texts)}\n\nBased on the candidate's resume, which option should be selected? Reply with ONLY the exact option text."
                 )
-                for opt in option_texts:
-                    if opt.lower() == llm_answer.lower() or opt.lower() in llm_answer.lower():
-                        best_match = opt
-                        break
+            if not best_match and llm_answer:
+                # Exact option first, then the first option the answer contains
+                lower_options = {opt.lower(): opt for opt in option_texts}
+                answer_lower = llm_answer.lower()
+                best_match = lower_options.get(answer_lower) or next(
+                    (opt for opt_lower, opt in lower_options.items() if opt_lower in answer_lower), None
+                )
             
             # Default: first option
             if not best_match:
@@ -650,8 +1317,9 @@ Best regards,
             for i, opt_text in enumerate(option_texts):
                 if opt_text == best_match:
                     try:
-                        await option_labels[i].click()
-                        await asyncio.sleep(0.2)
+                        radio = radio_buttons[option_indices[i]]
+                        await radio.evaluate(_CLICK_RADIO_LABEL_JS)
+                        await self._settle(radio, "el => el.checked")
                         result["fields_filled"].append(f"radio_{question[:20]}")
                         logger.info(f"✓ Selected '{best_match}' for '{question[:30]}'")
                         return True
@@ -668,54 +1336,66 @@ Best regards,
         """Fill checkboxes - consent boxes and relevant options. Returns True if any checked."""
         try:
             checked_any = False
-            consent_prefs = self.resume_helper.get_consent_preferences()
-            auto_check_consent = consent_prefs.get("auto_check_consent", True)
-            auto_check_terms = consent_prefs.get("auto_check_terms", True)
-            auto_check_privacy = consent_prefs.get("auto_check_privacy", True)
+            auto_check_kinds = self._auto_check_kinds()
             
-            for checkbox in checkboxes:
+            # Options the pre-pass batch chose for this question, if it was asked
+            batch_choice = self._batch_answers.get(question)
+            batch_selected = None
+            if batch_choice is not None:
+                batch_selected = {opt.strip().lower() for opt in batch_choice.split("|")}
+            
+            # Read every checkbox's checked state and label in one round-trip
+            states = await item.eval_on_selector_all('input[type="checkbox"]', _CHECKBOX_STATES_JS)
+            # (checkbox, label) pairs left for a per-option LLM question
+            to_ask = []
+            
+            for checkbox, state in zip(checkboxes, states):
                 try:
-                    if await checkbox.is_checked():
+                    if state["checked"]:
                         checked_any = True
                         continue
                     
-                    label_text = await checkbox.evaluate("el => el.closest('label')?.innerText || el.parentElement?.innerText || ''")
+                    label_text = state["text"]
                     label_lower = label_text.lower()
                     
-                    if auto_check_consent and any(word in label_lower for word in ["consent", "agree", "accept", "acknowledge", "confirm"]):
+                    kind = self._checkbox_category(label_lower, auto_check_kinds)
+                    if kind:
                         await checkbox.click()
-                        await asyncio.sleep(0.2)
-                        logger.info(f"✓ Checked consent: {label_text[:40]} (from preferences)")
+                        await self._settle(checkbox, "el => el.checked")
+                        logger.info(f"✓ Checked {kind}: {label_text[:40]} (from preferences)")
                         checked_any = True
                         continue
                     
-                    if auto_check_terms and "terms" in label_lower:
-                        await checkbox.click()
-                        await asyncio.sleep(0.2)
-                        logger.info(f"✓ Checked terms: {label_text[:40]} (from preferences)")
-                        checked_any = True
-                        continue
-                    
-                    if auto_check_privacy and "privacy" in label_lower:
-                        await checkbox.click()
-                        await asyncio.sleep(0.2)
-                        logger.info(f"✓ Checked privacy: {label_text[:40]} (from preferences)")
-                        checked_any = True
-                        continue
-                    
-                    # For other checkboxes, use LLM if available
-                    if self.llm_client:
-                        should_check = self.llm_client.ask(
-                            f"Question: {question}\nOption: {label_text}",
-                            self.resume_data,
-                            self.job_description,
-                            "Should this checkbox be selected based on the candidate's resume? Answer only 'yes' or 'no'."
-                        )
-                        if "yes" in should_check.lower():
+                    # For other checkboxes, use the batched LLM answer or ask
+                    if batch_selected is not None:
+                        if label_text.strip().lower() in batch_selected:
                             await checkbox.click()
-                            await asyncio.sleep(0.2)
+                            await self._settle(checkbox, "el => el.checked")
                             logger.info(f"✓ Checked: {label_text[:30]}")
                             checked_any = True
+                    elif self.llm_client:
+                        to_ask.append((checkbox, label_text))
+                except:
+                    continue
+            
+            # The options are independent, so ask about them concurrently
+            replies = await asyncio.gather(*(
+                self.llm_client.ask(
+                    f"Question: {question}\nOption: {label_text}",
+                    self.resume_data,
+                    self.job_description,
+                    "Should this checkbox be selected based on the candidate's resume? Answer only 'yes' or 'no'."
+                )
+                for _, label_text in to_ask
+            ))
+            for (checkbox, label_text), should_check in zip(to_ask, replies):
+                if should_check[:3].lower() != "yes":
+                    continue
+                try:
+                    await checkbox.click()
+                    await self._settle(checkbox, "el => el.checked")
+                    logger.info(f"✓ Checked: {label_text[:30]}")
+                    checked_any = True
                 except:
                     continue
             
@@ -728,11 +1408,22 @@ Best regards,
             logger.warning(f"Checkbox error: {e}")
             return False
     
-    async def fill_text_smart(self, item, text_input, question: str, result: Dict[str, Any]) -> bool:
-        """Fill text field with resume data or LLM answer. Returns True if filled."""
+    async def fill_text_smart(self, item, text_input, question: str, result: Dict[str, Any],
+                              current_value: Optional[str] = None) -> bool:
+        """Fill text field with resume data or LLM answer. Returns True if filled.
+        
+        Args:
+            item: Form item containing the input
+            text_input: The text input or textarea
+            question: Question text
+            result: Result dict to update
+            current_value: Input value already read by the caller ("" when
+                known to be empty); read from the page when None
+        """
         try:
             # Check if already filled
-            current_value = await text_input.input_value()
+            if current_value is None:
+                current_value = await text_input.input_value()
             if current_value and len(current_value.strip()) > 0:
                 logger.info(f"Text field already filled: {question[:30]}...")
                 return True
@@ -740,22 +1431,21 @@ Best regards,
             # Get answer from resume first
             answer = self.resume_helper.get_answer(question)
             
-            # If not in resume, use LLM
+            # If not in resume, use the batched LLM answer or ask
+            if not answer:
+                answer = self._batch_answers.get(question)
             if not answer and self.llm_client:
-                answer = self.llm_client.ask(
+                answer = await self.llm_client.ask(
                     f"Question: {question}",
                     self.resume_data,
                     self.job_description,
-                    "Based on the candidate's resume, provide a concise professional answer. Keep it brief (1-2 sentences for short answer, 3-4 for longer questions)."
+                    _TEXT_ANSWER_CONTEXT
                 )
             
             if answer:
-                await text_input.scroll_into_view_if_needed()
-                await asyncio.sleep(0.1)
-                await text_input.click()
-                await asyncio.sleep(0.1)
+                # fill scrolls, focuses and auto-waits; just confirm the value landed
                 await text_input.fill(answer)
-                await asyncio.sleep(0.2)
+                await self._settle(text_input, "el => el.value !== ''")
                 result["fields_filled"].append(f"text_{question[:20]}")
                 logger.info(f"✓ Filled '{question[:30]}': {answer[:30]}...")
                 return True
@@ -769,20 +1459,25 @@ Best regards,
     async def upload_resume(self, result: Dict[str, Any]):
         """Upload resume file."""
         try:
-            resume_item = await self.page.query_selector('li:has-text("Resume")')
-            if not resume_item:
-                resume_item = await self.page.query_selector('li:has-text("CV")')
-            
-            if resume_item:
-                attach_link = await resume_item.query_selector('a:has-text("ATTACH")')
-                if attach_link:
-                    await attach_link.click()
-                    await asyncio.sleep(0.5)
-            
+            # set_input_files works on the input directly; only click ATTACH to
+            # reveal it when it isn't in the DOM yet, since the click moves
+            # focus away from fields that may be filling concurrently
             file_input = await self.page.query_selector('input[type="file"]')
+            if not file_input:
+                resume_item = await self.page.query_selector('li:has-text("Resume")')
+                if not resume_item:
+                    resume_item = await self.page.query_selector('li:has-text("CV")')
+                
+                if resume_item:
+                    attach_link = await resume_item.query_selector('a:has-text("ATTACH")')
+                    if attach_link:
+                        await attach_link.click()
+                        await self._sleep(0.5)
+                
+                file_input = await self.page.query_selector('input[type="file"]')
             if file_input and self.resume_file_path:
-                await file_input.set_input_files(self.resume_file_path)
-                await asyncio.sleep(2)
+                await file_input.set_input_files(self.resume_file or self.resume_file_path)
+                await self._sleep(2)
                 result["fields_filled"].append("resume")
                 logger.info("Resume uploaded")
             else:
@@ -792,278 +1487,161 @@ Best regards,
             logger.warning(f"Resume upload error: {e}")
             result["errors"].append(f"Resume: {str(e)}")
     
-    async def verify_and_fill_empty_fields(self, result: Dict[str, Any]):
-        """Verify all fields are filled and re-fill empty ones."""
-        logger.info("Scanning all form fields for empty values...")
+    async def verify_pass(self, result: Dict[str, Any], max_passes: int = 2) -> bool:
+        """Verify all fields are filled, re-filling empty ones between scans.
         
-        # First, explicitly check and fill diversity fields
-        await self.fill_diversity_fields(result)
+        Each pass scans the form once; the last scan doubles as the final
+        verification, and required fields still empty are reported. Scanning
+        stops as soon as nothing is empty, and later scans only re-read the
+        items the previous scan found empty.
         
-        # Then check consent checkboxes again
-        await self.fill_all_consent_checkboxes(result)
+        Args:
+            result: Application result dict to update
+            max_passes: Number of form scans (re-fills happen between them)
         
-        # Get all form items
-        form_items = await self.page.query_selector_all('form li')
-        empty_fields = []
+        Returns:
+            True if no required field is left empty
+        """
+        logger.info("Scanning all form fields for empty values...")
         
-        for item in form_items:
-            try:
-                item_text = await item.inner_text()
-                if not item_text:
-                    continue
-                    
-                question = item_text.split('\n')[0].strip()
-                has_dropdown = await item.query_selector('[role="combobox"], select')
-                
-                if len(question) < 15 and "?" not in question and "✱" not in question:
-                    if not has_dropdown:
-                        continue
-                
-                if any(skip in question.lower() for skip in ["linkedin", "portfolio", "website", "github"]):
-                    continue
-                
-                words = question.split()
-                is_diversity_field = any(word in question.lower() for word in ["ethnicity", "race", "ethnic", "gender", "age bracket", "veteran", "disability"])
-                if len(words) <= 3 and "?" not in question and "✱" not in question and "*" not in question:
-                    if not is_diversity_field and not has_dropdown:
-                        continue
-                
-                # Check different field types
-                text_input = await item.query_selector('input[type="text"], textarea')
-                if text_input:
-                    value = await text_input.input_value()
-                    if not value or value.strip() == "":
-                        empty_fields.append(("text", item, question))
-                        logger.warning(f"EMPTY TEXT: {question[:50]}...")
-                    continue
-                
-                dropdown = await item.query_selector('[role="combobox"], select')
-                if dropdown:
-                    # Check if dropdown actually has a value selected
-                    # For Lever comboboxes, check the input element inside
-                    is_filled = await dropdown.evaluate('''
-                        (el) => {
-                            // For select elements, check if a real option is selected
-                            if (el.tagName === 'SELECT') {
-                                return el.selectedIndex > 0 && el.value && el.value !== '' && el.value !== 'Select';
-                            }
-                            
-                            // For combobox (Lever style), check the input element
-                            const input = el.querySelector('input[type="text"], input[type="hidden"]');
-                            if (input) {
-                                const value = input.value || input.getAttribute('value') || '';
-                                const trimmed = value.trim();
-                                // Check if it has a real value (not empty, not "Select", not placeholder)
-                                if (trimmed && trimmed.length > 2 && !trimmed.toLowerCase().includes('select')) {
-                                    return true;
-                                }
-                            }
-                            
-                            // Check if dropdown is open (if open, might not be filled, but could be false positive)
-                            const isOpen = el.getAttribute('aria-expanded') === 'true';
-                            
-                            // Check for selected option visible
-                            const selectedOption = el.querySelector('[aria-selected="true"], .selected, option[selected]');
-                            if (selectedOption && selectedOption.textContent) {
-                                const text = selectedOption.textContent.trim();
-                                if (text && text.length > 2 && !text.toLowerCase().includes('select')) {
-                                    return true;
-                                }
-                            }
-                            
-                            // Check the visible text - if it's a single line and not "Select", it's probably filled
-                            const text = el.textContent || el.innerText || '';
-                            const lines = text.trim().split('\\n').filter(l => l.trim());
-                            // If only one line (or two with one being the selected value), and it's not "Select"
-                            if (lines.length <= 2) {
-                                const firstLine = lines[0] ? lines[0].trim() : '';
-                                if (firstLine && firstLine.length > 2 && 
-                                    !firstLine.toLowerCase().startsWith('select') &&
-                                    !firstLine.toLowerCase().includes('select...')) {
-                                    // Don't check if dropdown is open - just check if it looks filled
-                                    return true;
-                                }
-                            }
-                            
-                            return false;
-                        }
-                    ''')
-                    
-                    if not is_filled:
-                        # Double-check by looking at the input value directly
-                        input_elem = await dropdown.query_selector('input[type="text"], input[type="hidden"]')
-                        if input_elem:
-                            input_value = await input_elem.input_value()
-                            if input_value and input_value.strip() and len(input_value.strip()) > 2 and "select" not in input_value.lower():
-                                is_filled = True
-                        
-                        if not is_filled:
-                            dropdown_text = await dropdown.inner_text()
-                            empty_fields.append(("dropdown", item, question))
-                            logger.warning(f"EMPTY DROPDOWN: {question[:50]}... (text: '{dropdown_text[:30]}')")
-                    continue
-                
-                radios = await item.query_selector_all('input[type="radio"]')
-                if len(radios) > 1:
-                    any_checked = False
-                    for radio in radios:
-                        if await radio.is_checked():
-                            any_checked = True
-                            break
-                    if not any_checked:
-                        empty_fields.append(("radio", item, question))
-                        logger.warning(f"EMPTY RADIO GROUP: {question[:50]}...")
-                    continue
-                
-                checkbox = await item.query_selector('input[type="checkbox"]')
-                if checkbox:
-                    is_checked = await checkbox.is_checked()
-                    if not is_checked:
-                        if any(word in question.lower() for word in ["consent", "agree", "accept", "acknowledge"]):
-                            empty_fields.append(("checkbox", item, question))
-                            logger.warning(f"UNCHECKED CONSENT: {question[:50]}...")
-                    continue
-                    
-            except Exception as e:
-                logger.debug(f"Error checking field: {e}")
+        # Check consent checkboxes again
+        await self.fill_all_consent_checkboxes(result)
         
-        # Re-fill empty fields
-        if empty_fields:
+        indices = None
+        for attempt in range(max_passes):
+            empty_fields = await self._scan_empty_fields(indices)
+            if not empty_fields or attempt == max_passes - 1:
+                break
             logger.info(f"Found {len(empty_fields)} empty fields. Re-filling...")
-            
-            for field_type, item, question in empty_fields:
-                try:
-                    logger.info(f"Re-filling: {question[:40]}...")
-                    
-                    if field_type == "text":
-                        text_input = await item.query_selector('input[type="text"], textarea')
-                        if text_input:
-                            await self.fill_text_smart(item, text_input, question, result)
-                    
-                    elif field_type == "dropdown":
-                        await self.fill_dropdown_smart(item, question, result)
-                    
-                    elif field_type == "radio":
-                        radios = await item.query_selector_all('input[type="radio"]')
-                        if radios:
-                            await self.fill_radio_smart(item, radios, question, result)
-                    
-                    elif field_type == "checkbox":
-                        checkbox = await item.query_selector('input[type="checkbox"]')
-                        if checkbox:
-                            await checkbox.click()
-                            await asyncio.sleep(0.2)
-                            result["fields_filled"].append(f"checkbox_{question[:20]}")
-                            logger.info(f"Checked: {question[:40]}")
-                    
-                    await asyncio.sleep(0.3)
-                    
-                except Exception as e:
-                    logger.warning(f"Error re-filling {question[:30]}: {e}")
-                    result["fields_empty"].append(question[:50])
+            await self._refill_fields(empty_fields, result)
+            indices = [index for *_, index in empty_fields]
+        
+        still_empty = [
+            question for _, _, question, is_required, _ in empty_fields
+            if is_required and "additional" not in question.lower()
+        ]
+        for question in still_empty:
+            logger.error(f"STILL EMPTY: {question[:50]}...")
+            result["fields_empty"].append(question[:50])
+        
+        if not still_empty:
+            logger.info("✓ ALL REQUIRED FIELDS ARE FILLED!")
         else:
-            logger.info("All fields appear to be filled!")
+            logger.warning(f"⚠ {len(still_empty)} required fields still empty")
+        return not still_empty
     
-    async def final_verification(self, result: Dict[str, Any]):
-        """Final check of all required fields."""
-        logger.info("Performing final verification...")
+    async def _snapshot_fields(self, indices: Optional[List[int]] = None) -> List[Optional[Dict[str, Any]]]:
+        """Read the state of every form item in a single page round-trip.
         
-        all_filled = True
-        form_items = await self.page.query_selector_all('form li')
+        Args:
+            indices: Only describe the 'form li' items at these positions
         
-        for item in form_items:
-            try:
-                item_text = await item.inner_text()
-                if not item_text:
+        Returns:
+            One dict per 'form li' (in document order) with question, required,
+            has_dropdown, kind (text/dropdown/radio/checkbox or None) and filled;
+            None for items not in indices
+        """
+        return await self.page.eval_on_selector_all('form li', _FIELD_SNAPSHOT_JS, indices)
+    
+    async def _scan_empty_fields(self, indices: Optional[List[int]] = None) -> List[Tuple[str, Any, str, bool, int]]:
+        """Scan form items for unfilled fields.
+        
+        Args:
+            indices: Only scan the 'form li' items at these positions
+        
+        Returns:
+            (field_type, item, question, is_required, index) for each empty field
+        """
+        empty_fields = []
+        
+        for index, field in enumerate(await self._snapshot_fields(indices)):
+            # Filled items are the common case after the fill pass; drop them
+            # before any question text processing
+            if field is None or field["filled"]:
+                continue
+            question = field["question"]
+            if not question or not field["kind"]:
+                continue
+            has_dropdown = field["has_dropdown"]
+            
+            if len(question) < 15 and "?" not in question and "✱" not in question:
+                if not has_dropdown:
                     continue
-                    
-                question = item_text.split('\n')[0].strip()
-                
-                if len(question) < 15 and "?" not in question and "✱" not in question:
+            
+            tags = _question_tags(question.lower())
+            if "link" in tags:
+                continue
+            
+            words = question.split()
+            is_diversity_field = "diversity" in tags
+            if len(words) <= 3 and "?" not in question and "✱" not in question and "*" not in question:
+                if not is_diversity_field and not has_dropdown:
                     continue
-                
-                words = question.split()
-                if len(words) <= 3 and "?" not in question and "✱" not in question:
+            
+            field_type = field["kind"]
+            if field_type == "checkbox":
+                # Only unchecked consent boxes count as empty
+                if "consent" not in tags:
                     continue
+                logger.warning(f"UNCHECKED CONSENT: {question[:50]}...")
+            elif field_type == "dropdown":
+                logger.warning(f"EMPTY DROPDOWN: {question[:50]}... (text: '{field['dropdown_text'][:30]}')")
+            elif field_type == "radio":
+                logger.warning(f"EMPTY RADIO GROUP: {question[:50]}...")
+            else:
+                logger.warning(f"EMPTY TEXT: {question[:50]}...")
+            
+            empty_fields.append((index, field_type, question, field["required"]))
+        
+        # Element handles are only needed for the fields being re-filled; look
+        # them up concurrently so the queries pipeline over one connection
+        items = await asyncio.gather(
+            *(self.page.query_selector(f'[data-fh-idx="{index}"]') for index, *_ in empty_fields),
+            return_exceptions=True
+        )
+        return [
+            (field_type, item, question, required, index)
+            for (index, field_type, question, required), item in zip(empty_fields, items)
+            if item and not isinstance(item, BaseException)
+        ]
+    
+    async def _refill_fields(self, empty_fields: List[Tuple[str, Any, str, bool, int]], result: Dict[str, Any]):
+        """Re-fill fields found empty by _scan_empty_fields."""
+        for field_type, item, question, *_ in empty_fields:
+            try:
+                logger.info(f"Re-filling: {question[:40]}...")
                 
-                if any(skip in question.lower() for skip in ["linkedin", "website", "portfolio", "additional"]):
-                    continue
+                if field_type == "text":
+                    text_input = await item.query_selector('input[type="text"], textarea')
+                    if text_input:
+                        # The snapshot just reported it empty
+                        await self.fill_text_smart(item, text_input, question, result, current_value="")
                 
-                is_required = "✱" in item_text or "*" in item_text
-                if not is_required:
-                    continue
+                elif field_type == "dropdown":
+                    await self.fill_dropdown_smart(item, question, result, current_text="")
                 
-                # Check text inputs
-                text_input = await item.query_selector('input[type="text"], textarea')
-                if text_input:
-                    value = await text_input.input_value()
-                    if not value or value.strip() == "":
-                        logger.error(f"STILL EMPTY: {question[:50]}...")
-                        result["fields_empty"].append(question[:50])
-                        all_filled = False
-                    else:
-                        logger.info(f"✓ {question[:40]}: {value[:20]}...")
-                    continue
+                elif field_type == "radio":
+                    radios = await item.query_selector_all('input[type="radio"]')
+                    if radios:
+                        await self.fill_radio_smart(item, radios, question, result)
                 
-                # Check dropdowns
-                dropdown = await item.query_selector('[role="combobox"]')
-                if dropdown:
-                    dropdown_text = await dropdown.inner_text()
-                    if "Select" in dropdown_text:
-                        logger.error(f"STILL EMPTY: {question[:50]}...")
-                        result["fields_empty"].append(question[:50])
-                        all_filled = False
-                    else:
-                        logger.info(f"✓ {question[:40]}: {dropdown_text[:20]}...")
-                    continue
+                elif field_type == "checkbox":
+                    checkbox = await item.query_selector('input[type="checkbox"]')
+                    if checkbox:
+                        await checkbox.click()
+                        await self._settle(checkbox, "el => el.checked")
+                        result["fields_filled"].append(f"checkbox_{question[:20]}")
+                        logger.info(f"Checked: {question[:40]}")
                 
-                # Check radios
-                radios = await item.query_selector_all('input[type="radio"]')
-                if radios:
-                    any_checked = False
-                    for radio in radios:
-                        if await radio.is_checked():
-                            any_checked = True
-                            break
-                    if not any_checked:
-                        logger.error(f"STILL EMPTY: {question[:50]}...")
-                        result["fields_empty"].append(question[:50])
-                        all_filled = False
-                    else:
-                        logger.info(f"✓ {question[:40]}: (selected)")
-                        
             except Exception as e:
-                logger.debug(f"Verification error: {e}")
-        
-        if all_filled:
-            logger.info("=" * 50)
-            logger.info("✓ ALL REQUIRED FIELDS ARE FILLED!")
-            logger.info("=" * 50)
-        else:
-            logger.warning("=" * 50)
-            logger.warning(f"⚠ {len(result['fields_empty'])} required fields still empty")
-            logger.warning("=" * 50)
+                logger.warning(f"Error re-filling {question[:30]}: {e}")
     
     async def check_captcha(self) -> bool:
         """Check if CAPTCHA is present."""
-        captcha_selectors = [
-            'iframe[src*="captcha"]',
-            'iframe[src*="challenge"]',
-            '[class*="captcha"]',
-            '.g-recaptcha',
-            '.h-captcha',
-            '[data-sitekey]',
-        ]
-        
-        for sel in captcha_selectors:
-            try:
-                element = await self.page.query_selector(sel)
-                if element:
-                    return True
-            except:
-                continue
-        
-        return False
+        try:
+            return await self.page.query_selector(_CAPTCHA_SELECTOR) is not None
+        except:
+            return False
     
     async def solve_captcha(self) -> bool:
         """Detect and solve CAPTCHA using extension or direct API.
@@ -1073,70 +1651,15 @@ Best regards,
         """
         try:
             logger.info("Checking for CAPTCHA...")
-            has_captcha = await self.check_captcha()
+            # Detect presence, CAPTCHA type and site key in one round-trip
+            detection_result = await self.page.evaluate(_CAPTCHA_DETECT_JS, _CAPTCHA_SELECTOR)
             
-            if not has_captcha:
+            if not detection_result["present"]:
                 logger.info("No CAPTCHA detected")
                 return True
             
             logger.info("CAPTCHA detected, attempting to solve...")
             
-            # Detect CAPTCHA type and extract site key
-            detection_result = await self.page.evaluate('''
-                () => {
-                    const pageUrl = window.location.href;
-                    let captchaType = null;
-                    let siteKey = null;
-                    
-                    // Check for reCAPTCHA v2
-                    const recaptchaElement = document.querySelector('.g-recaptcha, [data-sitekey]');
-                    if (recaptchaElement) {
-                        siteKey = recaptchaElement.getAttribute('data-sitekey');
-                        if (siteKey) {
-                            captchaType = 'recaptcha_v2';
-                        }
-                    }
-                    
-                    // Check for hCaptcha
-                    if (!captchaType) {
-                        const hcaptchaElement = document.querySelector('.h-captcha');
-                        if (hcaptchaElement) {
-                            siteKey = hcaptchaElement.getAttribute('data-sitekey');
-                            if (siteKey) {
-                                captchaType = 'hcaptcha';
-                            }
-                        }
-                    }
-                    
-                    // Check iframes for site keys
-                    if (!siteKey) {
-                        const iframes = document.querySelectorAll('iframe[src*="recaptcha"], iframe[src*="hcaptcha"]');
-                        iframes.forEach(iframe => {
-                            try {
-                                const src = iframe.src;
-                                if (src.includes('recaptcha')) {
-                                    const match = src.match(/[&?]k=([^&]+)/);
-                                    if (match) {
-                                        siteKey = match[1];
-                                        captchaType = 'recaptcha_v2';
-                                    }
-                                } else if (src.includes('hcaptcha')) {
-                                    const match = src.match(/[&?]sitekey=([^&]+)/);
-                                    if (match) {
-                                        siteKey = match[1];
-                                        captchaType = 'hcaptcha';
-                                    }
-                                }
-                            } catch (e) {
-                                // Cross-origin
-                            }
-                        });
-                    }
-                    
-                    return { captchaType, siteKey, pageUrl };
-                }
-            ''')
-            
             if not detection_result or not detection_result.get('captchaType') or not detection_result.get('siteKey'):
                 logger.warning("Could not detect CAPTCHA type or site key")
                 return False
@@ -1153,29 +1676,13 @@ Best regards,
             
             # Trigger extension to solve via message
             try:
-                solved = await self.page.evaluate(f'''
-                    async () => {{
-                        // Check if extension is available
-                        if (window.__captchaDetection) {{
-                            // Extension detected CAPTCHA, trigger solve
-                            return new Promise((resolve) => {{
-                                chrome.runtime.sendMessage({{
-                                    action: 'solveCaptcha',
-                                    captchaType: '{captcha_type}',
-                                    siteKey: '{site_key}',
-                                    pageUrl: '{page_url}'
-                                }}, (response) => {{
-                                    resolve(response && response.success);
-                                }});
-                            }});
-                        }}
-                        return false;
-                    }}
-                ''')
+                solved = await self.page.evaluate(_EXTENSION_SOLVE_JS, {
+                    "captchaType": captcha_type, "siteKey": site_key, "pageUrl": page_url
+                })
                 
                 if solved:
                     logger.info("CAPTCHA solved via extension")
-                    await asyncio.sleep(2)  # Wait for injection
+                    await self._sleep(2)  # Wait for injection
                     return True
             except Exception as e:
                 logger.debug(f"Extension solve failed (expected if extension not available): {e}")
@@ -1185,39 +1692,22 @@ Best regards,
             from automation.captcha_solver import CaptchaSolver
             
             solver = CaptchaSolver()
-            solution = solver.solve_by_type(captcha_type, site_key, page_url)
+            try:
+                solution = await solver.solve_by_type(captcha_type, site_key, page_url)
+            finally:
+                await solver.aclose()
             
             if solution:
                 logger.info("CAPTCHA solved via API, injecting solution...")
                 
                 # Inject solution
-                injected = await self.page.evaluate(f'''
-                    (solution) => {{
-                        let success = false;
-                        
-                        if ('{captcha_type}' === 'recaptcha_v2') {{
-                            const textarea = document.querySelector('textarea[name="g-recaptcha-response"]');
-                            if (textarea) {{
-                                textarea.value = solution;
-                                textarea.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                                success = true;
-                            }}
-                        }} else if ('{captcha_type}' === 'hcaptcha') {{
-                            const textarea = document.querySelector('textarea[name="h-captcha-response"]');
-                            if (textarea) {{
-                                textarea.value = solution;
-                                textarea.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                                success = true;
-                            }}
-                        }}
-                        
-                        return success;
-                    }}
-                ''', solution)
+                injected = await self.page.evaluate(_INJECT_SOLUTION_JS, {
+                    "captchaType": captcha_type, "solution": solution
+                })
                 
                 if injected:
                     logger.info("Solution injected successfully")
-                    await asyncio.sleep(1)
+                    await self._sleep(1)
                     return True
                 else:
                     logger.warning("Solution received but injection failed")
@@ -1230,63 +1720,68 @@ Best regards,
             logger.error(f"Error solving CAPTCHA: {e}", exc_info=True)
             return False
     
+    async def _await_submit_outcome(self, original_url: str) -> Optional[str]:
+        """Wait for the outcome of a submit click.
+        
+        The in-page success check is polled with backoff while a navigation
+        listener waits for the page to leave original_url; a navigation ends
+        the wait as soon as the new document is parsed instead of at the
+        next poll.
+        
+        Args:
+            original_url: Page URL before the click
+        
+        Returns:
+            The matched success indicator, "url" if the page left the apply
+            form, or None if neither happened in time
+        """
+        timing = self.submit_timing
+        poll = asyncio.create_task(self._poll_until(
+            lambda: self.page.evaluate(_SUBMIT_OUTCOME_JS, _SUCCESS_TEXTS), initial=timing.poll_initial_s,
+            max_interval=timing.poll_max_interval_s, timeout=timing.outcome_timeout_s
+        ))
+        navigated = asyncio.create_task(self.page.wait_for_url(
+            lambda url: url != original_url, wait_until="domcontentloaded", timeout=timing.outcome_timeout_s * 1000
+        ))
+        try:
+            done, _ = await asyncio.wait({poll, navigated}, return_when=asyncio.FIRST_COMPLETED)
+            if navigated in done and poll not in done and navigated.exception() is None:
+                try:
+                    outcome = await self.page.evaluate(_SUBMIT_OUTCOME_JS, _SUCCESS_TEXTS)
+                    if outcome:
+                        return outcome
+                except Exception as e:
+                    logger.debug(f"Could not check page after submit navigation: {e}")
+            return await poll
+        finally:
+            for task in (poll, navigated):
+                if not task.done():
+                    task.cancel()
+    
     async def submit_form(self, result: Dict[str, Any]):
         """Submit the application form."""
         try:
-            # Try multiple strategies to find the visible submit button
+            # Find the first visible submit button in the page (polling until
+            # it renders) and tag it, so only the chosen one is fetched
             submit_btn = None
-            
-            # Strategy 1: Look for visible submit button (excluding hidden hCaptcha buttons)
             try:
-                submit_btn = await self.page.wait_for_selector(
-                    'button[type="submit"]:not(.hidden):not([class*="hidden"]):visible, '
-                    'button:has-text("Submit"):not(.hidden):not([class*="hidden"]):visible',
-                    timeout=3000
+                await self.page.wait_for_function(
+                    _FIND_SUBMIT_JS, arg=_SUBMIT_SELECTORS, timeout=self.submit_timing.find_button_ms
                 )
-            except:
-                pass
-            
-            # Strategy 2: Find all submit buttons and filter for visible ones
-            if not submit_btn:
-                try:
-                    buttons = await self.page.query_selector_all('button[type="submit"], button:has-text("Submit")')
-                    for btn in buttons:
-                        # Check if button is visible (not hidden)
-                        is_hidden = await btn.evaluate('''
-                            el => {
-                                const style = window.getComputedStyle(el);
-                                return style.display === 'none' || 
-                                       style.visibility === 'hidden' || 
-                                       el.classList.contains('hidden') ||
-                                       el.id.includes('hcaptcha');
-                            }
-                        ''')
-                        if not is_hidden:
-                            # Double check visibility
-                            bounding_box = await btn.bounding_box()
-                            if bounding_box and bounding_box['width'] > 0 and bounding_box['height'] > 0:
-                                submit_btn = btn
-                                break
-                except Exception as e:
-                    logger.debug(f"Strategy 2 failed: {e}")
-            
-            # Strategy 3: Look for Lever-specific submit button
-            if not submit_btn:
-                try:
-                    submit_btn = await self.page.wait_for_selector(
-                        'button[data-qa="submit"]:visible, '
-                        'button.postings-btn-template__button:visible, '
-                        'button.postings-btn:visible',
-                        timeout=2000
-                    )
-                except:
-                    pass
+                submit_btn = await self.page.query_selector('[data-auto-submit="1"]')
+            except Exception as e:
+                logger.debug(f"No visible submit button yet: {e}")
             
             if submit_btn:
                 logger.info("Found submit button, clicking...")
                 await submit_btn.scroll_into_view_if_needed()
-                await asyncio.sleep(0.5)
+                # Wait for smooth scrolling/layout shifts to stop moving the button
+                try:
+                    await submit_btn.wait_for_element_state("stable", timeout=self.submit_timing.button_stable_ms)
+                except Exception as e:
+                    logger.debug(f"Submit button not stable yet: {e}")
                 
+                original_url = self.page.url
                 # Try to click
                 try:
                     await submit_btn.click()
@@ -1294,22 +1789,12 @@ Best regards,
                     # Fallback: use JavaScript click
                     await submit_btn.evaluate('el => el.click()')
                 
-                await asyncio.sleep(3)
+                outcome = await self._await_submit_outcome(original_url)
                 
-                # Check for success indicators
-                success_indicators = [
-                    'text="Thank you"',
-                    'text="Application submitted"',
-                    'text="success"',
-                    '[data-qa="success"]'
-                ]
-                
-                for indicator in success_indicators:
-                    success = await self.page.query_selector(indicator)
-                    if success:
-                        result["fields_filled"].append("submitted")
-                        logger.info("Application submitted successfully!")
-                        return
+                if outcome and outcome != "url":
+                    result["fields_filled"].append("submitted")
+                    logger.info("Application submitted successfully!")
+                    return
                 
                 # If no success indicator found, check if we're still on the form page
                 current_url = self.page.url
@@ -1,26 +1,169 @@
 """LLM client wrapper for OpenAI."""
+import asyncio
+import atexit
+import hashlib
 import json
 import logging
-from typing import Optional
-from openai import OpenAI
-from utils.config import OPENAI_API_KEY
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from openai import AsyncOpenAI
+from pydantic import BaseModel, ValidationError
+from utils.config import OPENAI_API_KEY, LLM_CACHE_PATH
 
 logger = logging.getLogger(__name__)
 
+# Answers shared across clients/applications, keyed by a digest of resume, job
+# description, normalized question and context (which carries any option
+# list); least recently used entries are evicted. Loaded from LLM_CACHE_PATH
+# on first use and written back at exit, so repeat runs skip the API.
+_ANSWER_CACHE_MAX_SIZE = 512
+_answer_cache: "Optional[OrderedDict[str, str]]" = None
+
+
+# Most questions sent in one ask_batch request; at 200 output tokens each,
+# a request stays far below gpt-4o's output token limit
+_BATCH_MAX_QUESTIONS = 20
+
+
+# Bump when the user-prompt template or answer post-processing changes, so
+# answers cached on disk under the old wording are not reused
+_PROMPT_VERSION = "1"
+
+
+def _digest(*parts: str) -> str:
+    """Stable digest of several strings used to key the answer cache.
+    
+    Each part is length-prefixed, so text moving between parts (e.g. from the
+    question into the options context) can never produce the same key.
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8")
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+
+def _get_answer_cache() -> "OrderedDict[str, str]":
+    """Get the answer cache, loading it from disk on first use."""
+    global _answer_cache
+    if _answer_cache is None:
+        _answer_cache = OrderedDict()
+        if LLM_CACHE_PATH and Path(LLM_CACHE_PATH).exists():
+            try:
+                with open(LLM_CACHE_PATH, "r") as f:
+                    _answer_cache.update(json.load(f))
+            except Exception as e:
+                logger.warning(f"Could not read LLM answer cache: {e}")
+        atexit.register(_save_answer_cache)
+    return _answer_cache
+
+
+def _save_answer_cache():
+    """Write the answer cache to LLM_CACHE_PATH (registered with atexit)."""
+    if not LLM_CACHE_PATH or not _answer_cache:
+        return
+    try:
+        with open(LLM_CACHE_PATH, "w") as f:
+            json.dump(_answer_cache, f)
+    except Exception as e:
+        logger.warning(f"Could not write LLM answer cache: {e}")
+
+
+def _normalize_question(question: str) -> str:
+    """Fold case, whitespace and trailing punctuation/required markers."""
+    return " ".join(question.lower().split()).rstrip(" *?:.")
+
+
+def _cache_key(system_prompt: str, job_excerpt: str, question: str, context: str) -> str:
+    """Answer cache key for a question asked with the given prompt parts."""
+    return _digest(_PROMPT_VERSION, system_prompt, job_excerpt, _normalize_question(question), context)
+
+
+# application_preferences sections the LLM never needs (consent checkboxes
+# are ticked without it), left out of the prompt
+_PROMPT_EXCLUDED_PREFS = frozenset({"consent_preferences"})
+
+
+def build_system_prompt(resume_data: dict) -> str:
+    """
+    Build the static system prompt holding the instructions and resume.
+    
+    Keeping the resume in an unchanging leading message lets OpenAI's
+    automatic prompt caching reuse it across every question. The resume is
+    serialized compactly and without sections no question needs, since
+    every prompt token adds to prefill time.
+    
+    Args:
+        resume_data: Candidate's resume data
+        
+    Returns:
+        System prompt text
+    """
+    prefs = resume_data.get("application_preferences")
+    if isinstance(prefs, dict):
+        resume_data = {
+            **resume_data,
+            "application_preferences": {k: v for k, v in prefs.items() if k not in _PROMPT_EXCLUDED_PREFS},
+        }
+    resume_json = json.dumps(resume_data, separators=(",", ":"), ensure_ascii=False)
+    return f"""Based on the candidate's resume and the job description, provide a concise, professional answer to each application question.
+
+Resume:
+{resume_json}
+
+Provide ONLY the answer, no explanations. Keep it brief and professional (1-3 sentences max for text fields, single word/option for multiple choice)."""
+
+
+class BatchAnswers(BaseModel):
+    """Expected shape of an ask_batch reply."""
+    answers: Dict[str, str]
+
 
 class LLMClient:
     """Wrapper for OpenAI LLM API."""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize LLM client."""
+    def __init__(self, api_key: Optional[str] = None, system_prompt: Optional[str] = None):
+        """
+        Initialize LLM client.
+        
+        Args:
+            api_key: OpenAI API key (defaults to config)
+            system_prompt: Prebuilt prompt from build_system_prompt; when omitted
+                it is built from the resume passed to each ask() call
+        """
         self.api_key = api_key or OPENAI_API_KEY
+        self.system_prompt = system_prompt
+        # Last resume/job description seen and the prompt parts built from
+        # them, so repeated calls for the same application reuse them
+        self._prompt_source: Optional[dict] = None
+        self._built_prompt = ""
+        self._excerpt_source: Optional[str] = None
+        self._job_excerpt = ""
         if self.api_key:
-            self.client = OpenAI(api_key=self.api_key)
+            # Async client, so a pending answer doesn't block the browser work
+            # (and other applications) sharing the event loop
+            self.client = AsyncOpenAI(api_key=self.api_key)
         else:
             self.client = None
             logger.warning("No OpenAI API key - LLM features disabled")
     
-    def ask(self, question: str, resume_data: dict, job_description: str, context: str = "") -> str:
+    def _prompt_parts(self, resume_data: dict, job_description: str) -> Tuple[str, str]:
+        """Get the system prompt and job excerpt, rebuilding them only when the inputs change."""
+        if self.system_prompt:
+            system_prompt = self.system_prompt
+        else:
+            if resume_data is not self._prompt_source:
+                self._built_prompt = build_system_prompt(resume_data)
+                self._prompt_source = resume_data
+            system_prompt = self._built_prompt
+        if job_description is not self._excerpt_source:
+            self._job_excerpt = job_description[:2000]
+            self._excerpt_source = job_description
+        return system_prompt, self._job_excerpt
+    
+    async def ask(self, question: str, resume_data: dict, job_description: str, context: str = "") -> str:
         """
         Use LLM to answer a question based on resume and job context.
         
@@ -36,32 +179,158 @@ class LLMClient:
         if not self.client:
             return ""
         
+        system_prompt, job_excerpt = self._prompt_parts(resume_data, job_description)
+        cache_key = _cache_key(system_prompt, job_excerpt, question, context)
+        answer_cache = _get_answer_cache()
+        cached = answer_cache.get(cache_key)
+        if cached is not None:
+            answer_cache.move_to_end(cache_key)
+            logger.info(f"LLM answer (cached): {cached[:50]}...")
+            return cached
+        
         try:
-            prompt = f"""Based on the candidate's resume and the job description, provide a concise, professional answer to this application question.
-
-Resume:
-{json.dumps(resume_data, indent=2)}
-
-Job Description:
-{job_description[:2000]}
+            # Static resume first, then the per-job description, so successive
+            # questions share the longest possible cached prefix
+            prompt = f"""Job Description:
+{job_excerpt}
 
 Question: {question}
 
-{context}
-
-Provide ONLY the answer, no explanations. Keep it brief and professional (1-3 sentences max for text fields, single word/option for multiple choice)."""
+{context}"""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
                 max_tokens=200,
                 temperature=0.5
             )
             answer = response.choices[0].message.content.strip()
             logger.info(f"LLM answered: {answer[:50]}...")
+            if answer:
+                answer_cache[cache_key] = answer
+                if len(answer_cache) > _ANSWER_CACHE_MAX_SIZE:
+                    answer_cache.popitem(last=False)
             return answer
             
         except Exception as e:
             logger.error(f"LLM error: {e}")
             return ""
+    
+    async def ask_batch(self, questions: Dict[str, str], resume_data: dict, job_description: str,
+                        context: str = "") -> Dict[str, str]:
+        """
+        Answer several questions with a single JSON-mode LLM call.
+        
+        Cached answers are reused and only the remaining questions are sent,
+        at most _BATCH_MAX_QUESTIONS per request (larger forms are split into
+        concurrent requests so no reply outgrows the output token limit). Each
+        reply is validated against BatchAnswers; if it doesn't match, the
+        validation error is sent back once for a corrected reply.
+        
+        Args:
+            questions: Question ID -> question text
+            resume_data: Candidate's resume data
+            job_description: Job description text
+            context: Additional context/instructions applied to every question
+            
+        Returns:
+            Question ID -> answer for the questions that got a non-empty answer
+        """
+        if not self.client or not questions:
+            return {}
+        
+        system_prompt, job_excerpt = self._prompt_parts(resume_data, job_description)
+        answer_cache = _get_answer_cache()
+        answers = {}
+        pending = {}
+        for question_id, question in questions.items():
+            cache_key = _cache_key(system_prompt, job_excerpt, question, context)
+            cached = answer_cache.get(cache_key)
+            if cached is not None:
+                answer_cache.move_to_end(cache_key)
+                answers[question_id] = cached
+            else:
+                pending[question_id] = question
+        
+        if not pending:
+            logger.info(f"LLM batch answers (cached): {len(answers)}")
+            return answers
+        
+        # Fixed-size chunks keep each reply well under the model's output
+        # token limit; the chunks are sent concurrently
+        pending_items = list(pending.items())
+        chunks = [
+            dict(pending_items[i:i + _BATCH_MAX_QUESTIONS])
+            for i in range(0, len(pending_items), _BATCH_MAX_QUESTIONS)
+        ]
+        replies = await asyncio.gather(*(
+            self._ask_batch_chunk(chunk, system_prompt, job_excerpt, context) for chunk in chunks
+        ))
+        
+        for chunk, batch in zip(chunks, replies):
+            for question_id, question in chunk.items():
+                answer = str(batch.get(question_id) or "").strip()
+                if not answer:
+                    continue
+                answers[question_id] = answer
+                answer_cache[_cache_key(system_prompt, job_excerpt, question, context)] = answer
+                if len(answer_cache) > _ANSWER_CACHE_MAX_SIZE:
+                    answer_cache.popitem(last=False)
+        logger.info(f"LLM answered {len(answers)}/{len(questions)} questions in {len(chunks)} batch call(s)")
+        return answers
+    
+    async def _ask_batch_chunk(self, pending: Dict[str, str], system_prompt: str, job_excerpt: str,
+                               context: str) -> Dict[str, str]:
+        """
+        Send one ask_batch JSON-mode request for at most _BATCH_MAX_QUESTIONS questions.
+        
+        Args:
+            pending: Question ID -> question text
+            system_prompt: System prompt from _prompt_parts
+            job_excerpt: Job description excerpt from _prompt_parts
+            context: Additional context/instructions applied to every question
+            
+        Returns:
+            Question ID -> answer from the validated reply, or {} on failure
+        """
+        prompt = f"""Job Description:
+{job_excerpt}
 
+Questions (JSON object mapping id to question):
+{json.dumps(pending, indent=2)}
+
+{context}
+
+Return a JSON object of the form {{"answers": {{"<id>": "<answer>"}}}} with one answer per id."""
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ]
+        
+        batch = None
+        # One retry, telling the model what was wrong with its first reply
+        for attempt in range(2):
+            try:
+                response = await self.client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    max_tokens=200 * len(pending),
+                    temperature=0.5
+                )
+                content = response.choices[0].message.content
+                batch = BatchAnswers.model_validate_json(content).answers
+                break
+            except ValidationError as e:
+                logger.warning(f"LLM batch reply did not match the schema (attempt {attempt + 1}): {e}")
+                messages += [
+                    {"role": "assistant", "content": content},
+                    {"role": "user", "content": f"That reply was invalid: {e}\nReturn only the corrected JSON object."}
+                ]
+            except Exception as e:
+                logger.error(f"LLM batch error: {e}")
+                return {}
+        return batch or {}
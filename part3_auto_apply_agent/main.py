@@ -1,9 +1,11 @@
 """Main entry point for Lever job application agent."""
 import asyncio
-import json
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
+import msgspec
 from core.agent import LeverJobApplicant
 
 # Configure logging
@@ -14,6 +16,34 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _start_queue_logging() -> logging.handlers.QueueListener:
+    """Move log output off the event loop.
+    
+    The root logger's handlers are handed to a background QueueListener
+    thread and replaced with a single QueueHandler, so log calls between
+    Playwright round-trips only enqueue the record.
+    
+    Returns:
+        The started listener (pass to _stop_queue_logging when done)
+    """
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *root.handlers, respect_handler_level=True
+    )
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
+def _stop_queue_logging(listener: logging.handlers.QueueListener):
+    """Flush queued records and restore the original root handlers."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+    logging.getLogger().handlers = list(listener.handlers)
+
+
 async def main():
     """Main entry point."""
     job_url = "https://jobs.lever.co/ekimetrics/d9d64766-3d42-4ba9-94d4-f74cdaf20065"
@@ -23,8 +53,7 @@ async def main():
     
     # Load resume data
     resume_path = Path(__file__).parent / "data" / "resume.json"
-    with open(resume_path, "r") as f:
-        resume_data = json.load(f)
+    resume_data = msgspec.json.decode(resume_path.read_bytes())
     
     # Resume file path
     resume_file = Path(__file__).parent / "data" / "resume.pdf"
@@ -34,7 +63,7 @@ async def main():
         logger.warning("No resume.pdf found in data/ folder")
     
     # Apply
-    applicant = LeverJobApplicant(resume_data, resume_file_path)
+    applicant = LeverJobApplicant(resume_data, resume_file_path, inspect_on_finish=True)
     result = await applicant.apply(job_url)
     
     # Print results
@@ -66,11 +95,21 @@ async def main():
     print("=" * 60 + "\n")
     
     # Save result
-    with open("lever_result.json", "w") as f:
-        json.dump(result, f, indent=2)
+    Path("lever_result.json").write_bytes(msgspec.json.format(msgspec.json.encode(result), indent=2))
     print("Result saved to lever_result.json")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # The CAPTCHA bridge serves inside this loop, so uvloop has to be
+    # installed here; it ships with uvicorn[standard] but not on Windows
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    log_listener = _start_queue_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        _stop_queue_logging(log_listener)
 
@@ -1,5 +1,6 @@
 """Configuration management for the auto-apply agent."""
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,14 +12,49 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 # CAPTCHA Configuration
 CAPTCHA_API_KEY = os.getenv("CAPTCHA_API_KEY", "")
 CAPTCHA_SERVICE = os.getenv("CAPTCHA_SERVICE", "2captcha")  # 2captcha, anticaptcha, capsolver
+# Public URL of the bridge's /captcha/pingback endpoint (must be registered with 2Captcha);
+# leave empty to poll for solutions instead
+CAPTCHA_PINGBACK_URL = os.getenv("CAPTCHA_PINGBACK_URL", "")
 
 # Application Configuration
 RESUME_FILE_PATH = os.getenv("RESUME_FILE_PATH", "./data/resume.pdf")
 RESUME_JSON_PATH = os.getenv("RESUME_JSON_PATH", "./data/resume.json")
+# Job descriptions keyed by posting URL, reused on retries (empty disables the file)
+JD_CACHE_PATH = os.getenv("JD_CACHE_PATH", "./data/jd_cache.json")
+# LLM answers (cover letters, dropdown picks, ...) reused across runs (empty disables the file)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./data/llm_cache.json")
 
 # Browser Configuration
 HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
 BROWSER_TIMEOUT = int(os.getenv("BROWSER_TIMEOUT", "60000"))  # 60 seconds default
+# Capture caller stack traces on every Playwright call (only needed for Playwright tracing)
+PW_INSPECT_STACK = os.getenv("PW_INSPECT_STACK", "0") == "1"
+# Multiplier for the fixed delays left in form filling (e.g. 0.3 on fast pages, 2 on slow ones)
+SLEEP_MULT = float(os.getenv("APPLY_AGENT_SLEEP_MULT", "1.0"))
+
+
+@dataclass(frozen=True)
+class SubmitTiming:
+    """Waits and polling used when submitting the form (see FormHandler.submit_form)."""
+    # How long to wait for a visible submit button to render
+    find_button_ms: int = 5000
+    # How long to wait for the scrolled-to button to stop moving
+    button_stable_ms: int = 2000
+    # How long to wait for a success indicator or navigation after the click
+    outcome_timeout_s: float = 10.0
+    # First and longest interval between success checks (doubling in between)
+    poll_initial_s: float = 0.1
+    poll_max_interval_s: float = 1.0
+
+
+# Defaults overridable per environment, e.g. lower on fast Lever pages
+SUBMIT_TIMING = SubmitTiming(
+    find_button_ms=int(os.getenv("SUBMIT_FIND_BUTTON_MS", "5000")),
+    button_stable_ms=int(os.getenv("SUBMIT_BUTTON_STABLE_MS", "2000")),
+    outcome_timeout_s=float(os.getenv("SUBMIT_OUTCOME_TIMEOUT_S", "10")),
+    poll_initial_s=float(os.getenv("SUBMIT_POLL_INITIAL_S", "0.1")),
+    poll_max_interval_s=float(os.getenv("SUBMIT_POLL_MAX_INTERVAL_S", "1.0")),
+)
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -1,10 +1,64 @@
 """Resume data helper utilities."""
 import logging
-from typing import Dict, Any, List, Optional
+import re
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def _compile_categories(patterns: List[Tuple[str, str]]) -> re.Pattern:
+    """Compile (category, regex) pairs into one pattern for a single match().
+    
+    Each category is an optional lookahead over the whole text, so one match
+    sets the named group of every category that occurs anywhere in it.
+    """
+    return re.compile("".join(f"(?=(?:.*?(?P<{key}>{regex}))?)" for key, regex in patterns), re.DOTALL)
+
+
+# Recurring question categories answered straight from the resume, in priority
+# order (sponsorship before the broader work-authorization pattern, which also
+# matches "visa")
+_QUESTION_PATTERNS = [
+    ("salary", r"salary"),
+    ("notice", r"notice"),
+    ("sponsorship", r"sponsor"),
+    ("work_auth", r"visa|authori[sz]ed|work.*permit|permit.*work"),
+    ("language", r"language"),
+    ("relocation", r"relocat"),
+    ("remote", r"remote"),
+    ("heard_from", r"hear about|did you hear|where did you find"),
+]
+_QUESTION_RE = _compile_categories(_QUESTION_PATTERNS)
+_QUESTION_CATEGORIES = tuple(key for key, _ in _QUESTION_PATTERNS)
+
+# Categories whose resume answer also fits a free-text field; the rest (a bare
+# "Yes"/"No" preference) are only used to pick among options. Any "visa"
+# question counts as work_auth here, sponsorship ones included.
+_TEXT_ANSWER_CATEGORIES = ("salary", "notice", "work_auth", "language")
+
+# Diversity preference key -> question keywords, checked in order
+_DIVERSITY_FIELDS = [
+    ("gender", r"gender"),
+    ("ethnicity", r"ethnic"),
+    ("race", r"race"),
+    ("age_bracket", r"age"),
+    ("veteran_status", r"veteran"),
+    ("disability_status", r"disability"),
+]
+
+# Question triggers for the get_default_dropdown_value branches, so one match
+# routes a question to every branch that applies
+_DROPDOWN_TRIGGER_RE = _compile_categories(_DIVERSITY_FIELDS + [
+    ("notice", r"notice"),
+    ("start_date", r"start|date"),
+    ("heard_from", r"hear|found|where did you"),
+    ("work_auth", r"authorized|visa|work.*permit|permit.*work"),
+    ("open_to", r"open to|willing|available"),
+    ("immediate", r"immediate|available"),
+    ("remote", r"remote"),
+])
+
+
 class ResumeHelper:
     """Helper class for extracting data from resume."""
     
@@ -14,77 +68,149 @@ class ResumeHelper:
         self.prefs = resume_data.get("application_preferences", {})
         self.diversity_prefs = self.prefs.get("diversity_fields", {})
         self.common_prefs = self.prefs.get("common_questions", {})
+        
+        # Answers derived from the resume are fixed, so build them once
+        salary = resume_data.get("salary_expectations", {})
+        self._salary_answer = (
+            f"${salary.get('min', 80000):,} - ${salary.get('max', 100000):,}" if salary else ""
+        )
+        self._notice_answer = resume_data.get("notice_period", "2 weeks")
+        self._visa_answer = resume_data.get("visa_status", "Authorized to work")
+        languages = resume_data.get("skills", {}).get("languages", ["English"])
+        self._language_answer = languages[0] if languages else ""
+        
+        # Question category (see _TEXT_ANSWER_CATEGORIES) -> direct answer
+        self._known_answers = {
+            "salary": self._salary_answer,
+            "notice": self._notice_answer,
+            "work_auth": self._visa_answer,
+            "language": self._language_answer,
+        }
+        # Answers used instead when picking among options (a Yes/No
+        # authorization question needs "Yes", not the visa status text)
+        self._known_choices = {
+            "sponsorship": self.common_prefs.get("require_visa_sponsorship", ""),
+            "work_auth": self.common_prefs.get("authorized_to_work", ""),
+            "relocation": self.common_prefs.get("open_to_relocation", ""),
+            "remote": self.common_prefs.get("open_to_remote", ""),
+            "heard_from": self.common_prefs.get("how_did_you_hear", ""),
+        }
+        
+        # Lowercased preferences matched against dropdown options
+        default_diversity = self.diversity_prefs.get("default", "Prefer not to say")
+        self._diversity_choices = {
+            key: (self.diversity_prefs.get(key) or default_diversity).lower() for key, _ in _DIVERSITY_FIELDS
+        }
+        self._start_date_pref = self.common_prefs.get("start_date_preference", "2 weeks notice").lower()
+        self._heard_from_pref = self.common_prefs.get("how_did_you_hear", "Job board").lower()
+        self._needs_sponsorship = self.common_prefs.get("require_visa_sponsorship", "No").lower() != "no"
+        self._remote_pref = self.common_prefs.get("open_to_remote", "Yes").lower()
+        self._relocation_pref = self.common_prefs.get("open_to_relocation", "No").lower()
+        self._immediate_pref = self.common_prefs.get("available_immediately", "Yes").lower()
+        
+        consent_prefs = self.prefs.get("consent_preferences", {})
+        self._consent_prefs = {
+            "auto_check_consent": consent_prefs.get("auto_check_consent", True),
+            "auto_check_terms": consent_prefs.get("auto_check_terms", True),
+            "auto_check_privacy": consent_prefs.get("auto_check_privacy", True)
+        }
+        
+        # Question text -> direct answer, filled as questions are seen
+        self._answer_cache: Dict[str, str] = {}
     
     def get_answer(self, question: str) -> str:
         """Try to get answer directly from resume data."""
-        q_lower = question.lower()
+        answer = self._answer_cache.get(question)
+        if answer is None:
+            answer = self._answer_cache[question] = self._lookup_answer(question.lower())
+        return answer
+    
+    def _lookup_answer(self, q_lower: str) -> str:
+        """Match a lowercased question against the precomputed resume answers."""
+        return self._known_answers.get(self._classify(q_lower, _TEXT_ANSWER_CATEGORIES), "")
+    
+    def classify_question(self, question: str) -> Optional[str]:
+        """Get the recurring-question category of a question, if any.
         
-        # Salary
-        if "salary" in q_lower:
-            salary = self.resume_data.get("salary_expectations", {})
-            if salary:
-                return f"${salary.get('min', 80000):,} - ${salary.get('max', 100000):,}"
+        Args:
+            question: Question text
         
-        # Notice period
-        if "notice" in q_lower:
-            return self.resume_data.get("notice_period", "2 weeks")
+        Returns:
+            Category key (salary, notice, sponsorship, work_auth, language,
+            relocation, remote, heard_from) or None
+        """
+        return self._classify(question.lower())
+    
+    @staticmethod
+    def _classify(q_lower: str, categories: Tuple[str, ...] = _QUESTION_CATEGORIES) -> Optional[str]:
+        """classify_question for an already lowercased question, limited to categories."""
+        hits = _QUESTION_RE.match(q_lower)
+        return next((key for key in categories if hits.group(key)), None)
+    
+    def answer_from_resume(self, question: str, options: Optional[List[str]] = None) -> Optional[str]:
+        """Answer a recurring question from the resume without the LLM.
+        
+        Args:
+            question: Question text
+            options: Choices of a dropdown/radio question, if any
         
-        # Visa/work authorization
-        if "visa" in q_lower or "authorized" in q_lower or ("work" in q_lower and "permit" in q_lower):
-            return self.resume_data.get("visa_status", "Authorized to work")
+        Returns:
+            The answer (or, with options, the option matching it), or None
+            when the resume doesn't settle the question
+        """
+        if options is None:
+            return self.get_answer(question) or None
         
-        # Languages
-        if "language" in q_lower:
-            languages = self.resume_data.get("skills", {}).get("languages", ["English"])
-            if languages:
-                return languages[0]
+        answer = self._known_choices.get(self.classify_question(question)) or self.get_answer(question)
+        if not answer:
+            return None
         
-        return ""
+        answer_lower = answer.lower()
+        for opt in options:
+            if opt.lower() == answer_lower:
+                return opt
+        # Substring matches only for longer texts, so "No" can't match "notice"
+        for opt in options:
+            opt_lower = opt.lower()
+            if len(opt_lower) > 3 and len(answer_lower) > 3 and (answer_lower in opt_lower or opt_lower in answer_lower):
+                return opt
+        return None
     
     def get_default_dropdown_value(self, question: str, options: List[str]) -> str:
         """Get default dropdown value from resume preferences or fallback logic."""
         q_lower = question.lower()
+        triggers = _DROPDOWN_TRIGGER_RE.match(q_lower)
+        # (lowercased, original) per option, shared by every branch below
+        pairs = [(opt.lower(), opt) for opt in options]
         
         # 1. Diversity/demographic fields - from resume.json preferences
-        diversity_keywords = {
-            "gender": ["gender"],
-            "ethnicity": ["ethnicity", "ethnic"],
-            "race": ["race"],
-            "age_bracket": ["age bracket", "age"],
-            "veteran_status": ["veteran"],
-            "disability_status": ["disability"]
-        }
-        
-        for field_key, keywords in diversity_keywords.items():
-            if any(keyword in q_lower for keyword in keywords):
-                preferred_value = self.diversity_prefs.get(field_key) or self.diversity_prefs.get("default", "Prefer not to say")
+        for field_key, _ in _DIVERSITY_FIELDS:
+            if triggers.group(field_key):
+                preferred_lower = self._diversity_choices[field_key]
                 # Try to find exact match or similar
-                for opt in options:
-                    opt_lower = opt.lower()
-                    if preferred_value.lower() in opt_lower or opt_lower in preferred_value.lower():
+                for opt_lower, opt in pairs:
+                    if preferred_lower in opt_lower or opt_lower in preferred_lower:
                         logger.info(f"Selected '{opt}' for diversity field '{field_key}' (from preferences)")
                         return opt
                 # Fallback: look for "prefer not to say" type options
-                for opt in options:
-                    opt_lower = opt.lower()
+                for opt_lower, opt in pairs:
                     if any(phrase in opt_lower for phrase in ["prefer not", "decline", "not to say"]):
                         return opt
         
         # 2. Common questions - from resume.json preferences
         # Notice period
-        if "notice" in q_lower:
-            preferred = self.common_prefs.get("start_date_preference", "2 weeks notice")
-            for opt in options:
-                if preferred.lower() in opt.lower() or opt.lower() in preferred.lower():
+        if triggers.group("notice"):
+            preferred_lower = self._start_date_pref
+            for opt_lower, opt in pairs:
+                if preferred_lower in opt_lower or opt_lower in preferred_lower:
                     return opt
             # Fallback to shortest notice
-            for opt in options:
-                if "1 week" in opt.lower() or "available" in opt.lower() or "immediate" in opt.lower():
+            for opt_lower, opt in pairs:
+                if "1 week" in opt_lower or "available" in opt_lower or "immediate" in opt_lower:
                     return opt
         
         # Start date
-        if "start" in q_lower or "date" in q_lower:
-            preferred = self.common_prefs.get("start_date_preference", "2 weeks notice")
+        if triggers.group("start_date"):
             # Try to match months
             months = ["February", "March", "January", "April", "May", "June", 
                      "July", "August", "September", "October", "November", "December"]
@@ -94,35 +220,32 @@ class ResumeHelper:
                         return opt
         
         # How did you hear
-        if "hear" in q_lower or "found" in q_lower or "where did you" in q_lower:
-            preferred = self.common_prefs.get("how_did_you_hear", "Job board")
-            for opt in options:
-                opt_lower = opt.lower()
-                if preferred.lower() in opt_lower or opt_lower in preferred.lower():
+        if triggers.group("heard_from"):
+            preferred_lower = self._heard_from_pref
+            for opt_lower, opt in pairs:
+                if preferred_lower in opt_lower or opt_lower in preferred_lower:
                     return opt
         
         # Work authorization / visa
-        if "authorized" in q_lower or "visa" in q_lower or ("work" in q_lower and "permit" in q_lower):
-            if self.common_prefs.get("require_visa_sponsorship", "No").lower() == "no":
-                for opt in options:
-                    opt_lower = opt.lower()
+        if triggers.group("work_auth"):
+            if not self._needs_sponsorship:
+                for opt_lower, opt in pairs:
                     if "yes" in opt_lower or "authorized" in opt_lower or "citizen" in opt_lower or "no" in opt_lower:
                         return opt
         
         # Yes/No questions - from preferences
         if len(options) <= 3:
-            yes_no_options = [opt for opt in options if opt.lower() in ["yes", "no"]]
+            yes_no_options = [(opt_lower, opt) for opt_lower, opt in pairs if opt_lower in ["yes", "no"]]
             if yes_no_options:
                 # Check preferences
-                if "open to" in q_lower or "willing" in q_lower or "available" in q_lower:
-                    preferred = self.common_prefs.get("open_to_remote", "Yes") if "remote" in q_lower else self.common_prefs.get("open_to_relocation", "No")
-                    for opt in yes_no_options:
-                        if preferred.lower() in opt.lower():
-                            return opt
-                elif "immediate" in q_lower or "available" in q_lower:
-                    preferred = self.common_prefs.get("available_immediately", "Yes")
-                    for opt in yes_no_options:
-                        if preferred.lower() in opt.lower():
+                preferred_lower = None
+                if triggers.group("open_to"):
+                    preferred_lower = self._remote_pref if triggers.group("remote") else self._relocation_pref
+                elif triggers.group("immediate"):
+                    preferred_lower = self._immediate_pref
+                if preferred_lower is not None:
+                    for opt_lower, opt in yes_no_options:
+                        if preferred_lower in opt_lower:
                             return opt
         
         # Default: first non-empty option
@@ -134,10 +257,4 @@ class ResumeHelper:
     
     def get_consent_preferences(self) -> Dict[str, bool]:
         """Get consent checkbox preferences."""
-        consent_prefs = self.prefs.get("consent_preferences", {})
-        return {
-            "auto_check_consent": consent_prefs.get("auto_check_consent", True),
-            "auto_check_terms": consent_prefs.get("auto_check_terms", True),
-            "auto_check_privacy": consent_prefs.get("auto_check_privacy", True)
-        }
-
+        return self._consent_prefs